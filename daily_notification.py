@@ -5,6 +5,11 @@ import json
 import os
 from plyer import notification
 import time
+import uuid
+from deadline_tracker.utils.atomic_file import atomic_write
+from deadline_tracker.utils.timers import TimerRegistry
+from deadline_tracker.utils.notification_digest import DigestAggregator
+from deadline_tracker import config
 
 
 class DeadlineTracker:
@@ -15,6 +20,10 @@ class DeadlineTracker:
 
         self.deadlines = []
         self.last_notification_time = {}  # Для отслеживания времени последних уведомлений
+        self.timers = TimerRegistry(self.root)  # не больше одного ожидающего обновления
+        # Тот же лимит уведомлений и размер сводки, что у deadline_tracker
+        self.digest = DigestAggregator(config.NOTIFICATION_RATE_LIMIT, config.NOTIFICATION_RATE_WINDOW,
+                                       config.NOTIFICATION_DIGEST_MAX_NAMES)
         self.load_data()
 
         self.create_widgets()
@@ -140,7 +149,8 @@ class DeadlineTracker:
                 "name": name,
                 "deadline": deadline_date,
                 "days_needed": days_needed,
-                "created": datetime.now()
+                "created": datetime.now(),
+                "id": uuid.uuid4().hex  # тот же постоянный id, что у дедлайнов deadline_tracker
             })
 
             # Очищаем поля ввода
@@ -149,7 +159,7 @@ class DeadlineTracker:
             self.days_needed_entry.delete(0, tk.END)
 
             self.save_data()
-            self.update_display()
+            self.request_refresh()
             messagebox.showinfo("Успех", "Дедлайн добавлен!")
 
         except ValueError as e:
@@ -252,7 +262,7 @@ class DeadlineTracker:
                 self.deadlines[index]["days_needed"] = new_days_needed
 
                 self.save_data()
-                self.update_display()
+                self.request_refresh()
                 edit_window.destroy()
                 messagebox.showinfo("Успех", "Дедлайн обновлен!")
 
@@ -285,7 +295,7 @@ class DeadlineTracker:
         if result:
             del self.deadlines[index]
             self.save_data()
-            self.update_display()
+            self.request_refresh()
 
     def calculate_time_remaining(self, deadline, days_needed):
         now = datetime.now()
@@ -322,7 +332,27 @@ class DeadlineTracker:
         except Exception as e:
             print(f"Ошибка отправки уведомления: {e}")
 
+    def send_digest_notification(self, deadline_names):
+        """Одно уведомление сразу о нескольких срочных дедлайнах"""
+        try:
+            notification.notify(
+                title=f"⚠️ Срочных дедлайнов: {len(deadline_names)}",
+                message=self.digest.digest_text(deadline_names),
+                timeout=100,
+                toast=True
+            )
+            print(f"Сводное уведомление отправлено для {len(deadline_names)} дедлайнов")
+        except Exception as e:
+            print(f"Ошибка отправки уведомления: {e}")
+
+    def request_refresh(self):
+        """Обновление после изменения; запросы до его выполнения сливаются в один"""
+        self.timers.request("refresh_now", self.update_display)
+
     def update_display(self):
+        # Это обновление выполняет и ожидающий запрос request_refresh
+        self.timers.cancel("refresh_now")
+
         # Очищаем treeview
         for item in self.tree.get_children():
             self.tree.delete(item)
@@ -331,6 +361,7 @@ class DeadlineTracker:
         self.deadlines.sort(key=lambda x: x["deadline"])
 
         current_time = datetime.now()
+        due = []  # срочные дедлайны, о которых пора напомнить
 
         # Добавляем дедлайны в treeview
         for deadline in self.deadlines:
@@ -360,41 +391,40 @@ class DeadlineTracker:
                     # Проверяем когда было последнее уведомление (не чаще чем раз в час)
                     last_notified = self.last_notification_time.get(deadline["name"])
                     if last_notified is None or (current_time - last_notified).total_seconds() >= 3600:  # 1 час
-                        self.send_urgent_notification(
-                            deadline["name"],
-                            days_remaining,
-                            deadline["days_needed"]
-                        )
-                        self.last_notification_time[deadline["name"]] = current_time
+                        due.append((deadline["name"], days_remaining, deadline["days_needed"]))
             else:
                 # Убираем подсветку если не срочно
                 self.tree.item(item, tags=())
 
-        # Настраиваем тег для красного цвета
-        self.tree.tag_configure("urgent", background="#ffcccc")
-
-        # Обновляем каждую минуту
-        self.root.after(60000, self.update_display)
+        # Отдельно - только о новых срочных, остальные одной сводкой
+        individual, digested = self.digest.plan(
+            due, lambda item: item[0] not in self.last_notification_time, current_time)
+        for name, days_remaining, days_needed in individual:
+            self.send_urgent_notification(name, days_remaining, days_needed)
+        if digested:
+            self.send_digest_notification([name for name, _, _ in digested])
+        for name, _, _ in individual + digested:
+            self.last_notification_time[name] = current_time
 
         # Настраиваем тег для красного цвета
         self.tree.tag_configure("urgent", background="#ffcccc")
 
-        # Обновляем каждую минуту
-        self.root.after(60000, self.update_display)
+        # Обновляем каждую минуту; прежний таймер заменяется, а не дублируется
+        self.timers.schedule("refresh", 60000, self.update_display)
 
     def save_data(self):
         # Сохраняем в JSON файл
+        # Остальные ключи записи (id и те, что добавит deadline_tracker) сохраняются как есть:
+        # по id окно и демон узнают дедлайны после записи из этого приложения
         data = []
         for deadline in self.deadlines:
-            data.append({
-                "name": deadline["name"],
-                "deadline": deadline["deadline"].isoformat(),
-                "days_needed": deadline["days_needed"],
-                "created": deadline["created"].isoformat()
-            })
+            item = dict(deadline)
+            item["deadline"] = deadline["deadline"].isoformat()
+            item["created"] = deadline["created"].isoformat()
+            data.append(item)
 
-        with open("deadlines.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Атомарно и под блокировкой: файл делится с deadline_tracker
+        atomic_write("deadlines.json", json.dumps(data, ensure_ascii=False, indent=2))
 
     def load_data(self):
         # Загружаем из JSON файла
@@ -404,12 +434,10 @@ class DeadlineTracker:
                     data = json.load(f)
 
                 for item in data:
-                    self.deadlines.append({
-                        "name": item["name"],
-                        "deadline": datetime.fromisoformat(item["deadline"]),
-                        "days_needed": item["days_needed"],
-                        "created": datetime.fromisoformat(item["created"])
-                    })
+                    deadline = dict(item)
+                    deadline["deadline"] = datetime.fromisoformat(item["deadline"])
+                    deadline["created"] = datetime.fromisoformat(item["created"])
+                    self.deadlines.append(deadline)
             except Exception as e:
                 print(f"Ошибка загрузки данных: {e}")
 
@@ -0,0 +1,45 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+from models.deadline import Deadline
+
+# Доли просроченных дедлайнов и дедлайнов без "дней на выполнение"
+PROFILES = {
+    "mixed": {"overdue": 0.1, "no_days_needed": 0.3},
+    "overdue_heavy": {"overdue": 0.5, "no_days_needed": 0.2},
+    "urgent_heavy": {"overdue": 0.05, "no_days_needed": 0.0},
+}
+
+_NAMES = ["Отчет", "Курсовая", "Лабораторная", "Презентация", "Налоги",
+          "Проект", "Экзамен", "Статья", "Ревью", "Релиз"]
+
+
+def generate_deadlines(count: int, profile="mixed", seed=0, now=None) -> List[Deadline]:
+    """Синтетические дедлайны: разные даты, days_needed от 1 до 30 и доля просроченных"""
+    if now is None:
+        now = datetime(2026, 1, 1, 12, 0)
+    settings = PROFILES[profile]
+    rng = random.Random(seed)
+
+    deadlines = []
+    for index in range(count):
+        if rng.random() < settings["overdue"]:
+            offset = -rng.randint(1, 60 * 24 * 90)
+        elif profile == "urgent_heavy":
+            offset = rng.randint(1, 60 * 24 * 10)
+        else:
+            offset = rng.randint(1, 60 * 24 * 365)
+
+        days_needed = None
+        if rng.random() >= settings["no_days_needed"]:
+            days_needed = rng.randint(1, 30)
+
+        deadlines.append(Deadline(
+            name=f"{rng.choice(_NAMES)} {index}",
+            deadline=(now + timedelta(minutes=offset)).replace(second=0, microsecond=0),
+            days_needed=days_needed,
+            created=now - timedelta(days=100, microseconds=index),
+            # Воспроизводимые идентификаторы при одинаковом seed
+            id=f"{seed:04x}{index:028x}"
+        ))
+    return deadlines
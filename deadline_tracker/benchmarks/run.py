@@ -0,0 +1,318 @@
+"""Замеры производительности ядра трекера без графического интерфейса.
+
+Запуск из каталога deadline_tracker:
+
+    python -m benchmarks.run --sizes 1000 10000 100000
+    python -m benchmarks.run --sizes 1000000 --only urgency_batch
+    python -m benchmarks.run --save-baseline      # записать benchmarks/baselines/<profile>.json
+    python -m benchmarks.run --only search --save-baseline   # обновить в базе только search
+    python -m benchmarks.run --compare            # сравнить с сохраненной базой
+
+Для каждой операции выводятся пропускная способность (дедлайнов в секунду),
+перцентили времени одного прогона и пиковая память (tracemalloc, отдельный прогон).
+С базой сравнивается лучший прогон (min_ms): он меньше всего зависит от
+посторонней нагрузки. Замедление считается регрессией, только если оно
+больше и допуска, и абсолютного порога --floor-ms: у операций короче
+миллисекунды шум измерения сам по себе дает десятки процентов.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+import config
+from benchmarks.generator import PROFILES, generate_deadlines
+from gui.format_cache import RenderCache
+from gui.tree_sync import TreeviewSync
+from models.collection import DeadlineCollection
+from models.deadline import Deadline
+from models.sorted_deadlines import SortedDeadlines
+from utils.batch_urgency import DeadlineArrays
+from utils.file_manager import FileManager
+from utils.jsonl_store import JsonLinesFileManager
+from utils.parallel import load_jsonl_collection, urgency_report, worker_count
+from utils.search_index import NameSearchIndex, SearchFilter
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+class _HeadlessTree:
+    """Treeview без окна: хранит строки в словаре, чтобы мерить логику обновления"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def __getitem__(self, option):
+        return ("name", "deadline", "days_needed", "remaining")
+
+    def yview(self):
+        return 0.0, 1.0
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def insert(self, parent, index, iid, values, tags):
+        self.rows[iid] = [values, tags]
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.rows[iid]
+
+    def move(self, iid, parent, index):
+        pass
+
+    def item(self, iid, values=None, tags=None):
+        if values is not None:
+            self.rows[iid][0] = values
+        if tags is not None:
+            self.rows[iid][1] = tags
+
+    def set(self, iid, column, value):
+        pass
+
+
+def _bench_file_save(deadlines, workdir, now):
+    manager = FileManager(os.path.join(workdir, "save.json"))
+    return lambda: manager.save_deadlines(deadlines)
+
+
+def _bench_file_load(deadlines, workdir, now):
+    manager = FileManager(os.path.join(workdir, "load.json"))
+    manager.save_deadlines(deadlines)
+    return manager.load_deadlines
+
+
+def _bench_from_dict(deadlines, workdir, now):
+    items = [d.to_dict() for d in deadlines]
+    return lambda: [Deadline.from_dict(item) for item in items]
+
+
+def _bench_jsonl_load(deadlines, workdir, now):
+    manager = JsonLinesFileManager(os.path.join(workdir, "load.jsonl"), legacy_filename=None)
+    manager.save_deadlines(deadlines)
+    return lambda: load_jsonl_collection(manager.filename, workers=1)
+
+
+def _bench_jsonl_load_parallel(deadlines, workdir, now):
+    # Не меньше двух процессов и частей, чтобы пул использовался при любом числе ядер
+    manager = JsonLinesFileManager(os.path.join(workdir, "load.jsonl"), legacy_filename=None)
+    manager.save_deadlines(deadlines)
+    workers = max(2, worker_count())
+    chunk_bytes = os.path.getsize(manager.filename) // workers + 1
+    return lambda: load_jsonl_collection(manager.filename, workers=workers, chunk_bytes=chunk_bytes,
+                                         threshold=0)
+
+
+def _bench_urgency_loop(deadlines, workdir, now):
+    return lambda: [(d.is_urgent(now), d.is_overdue(now)) for d in deadlines]
+
+
+def _bench_urgency_report(deadlines, workdir, now):
+    collection = DeadlineCollection(deadlines)
+    return lambda: urgency_report(collection, now, workers=1)
+
+
+def _bench_urgency_parallel(deadlines, workdir, now):
+    collection = DeadlineCollection(deadlines)
+    workers = max(2, worker_count())
+    return lambda: urgency_report(collection, now, threshold=0, workers=workers)
+
+
+def _bench_urgency_batch(deadlines, workdir, now):
+    arrays = DeadlineArrays(deadlines)
+    return lambda: arrays.evaluate(now)
+
+
+def _bench_range_query(deadlines, workdir, now):
+    """Дедлайны ближайшей недели из упорядоченного контейнера"""
+    container = SortedDeadlines(deadlines)
+    return lambda: container.between(now, now + timedelta(days=7))
+
+
+def _bench_search(deadlines, workdir, now):
+    """Запрос, набираемый по буквам: ответ индекса на каждое нажатие"""
+    index = NameSearchIndex(deadlines)
+    queries = ["о", "от", "отч", "отче", "отчет", "отчет ", "отчет 1", "отчет 12"]
+    return lambda: [index.search(query) for query in queries]
+
+
+def _bench_search_keystroke(deadlines, workdir, now):
+    """Путь нажатия клавиши в строке поиска целиком: поиск, позиции найденных
+    в упорядоченном списке и строки одного экрана виртуального списка"""
+    deadlines = SortedDeadlines(deadlines)
+    search_filter = SearchFilter(NameSearchIndex(deadlines))
+    cache = RenderCache()
+    sync = TreeviewSync(_HeadlessTree())
+    screen = 15 + 2 * config.VIRTUAL_OVERSCAN
+    queries = ["о", "от", "отч", "отче", "отчет", "отчет ", "отчет 1", "отчет 12"]
+
+    def remaining(deadline):
+        difference = deadline.deadline - now
+        if difference.total_seconds() <= 0:
+            return "ПРОСРОЧЕНО!"
+        return f"{difference.days} дн. {difference.seconds // 3600} ч. {difference.seconds % 3600 // 60} мин."
+
+    def row(deadline):
+        values = cache.row_values(deadline, now, lambda: remaining(deadline))
+        highlighted = deadline.is_overdue(now) or deadline.is_urgent(now)
+        return deadline.id, values, ("urgent",) if highlighted else ()
+
+    def type_query():
+        for query in queries:
+            visible = search_filter.positions(query, deadlines)
+            sync.sync(row(deadlines[index]) for index in visible[:screen])
+
+    return type_query
+
+
+def _bench_display_refresh(deadlines, workdir, now):
+    """Ежеминутное обновление списка: расчет, форматирование и сверка строк"""
+    deadlines = SortedDeadlines(deadlines)
+    cache = RenderCache(max_size=len(deadlines) + 1)
+    sync = TreeviewSync(_HeadlessTree())
+    arrays = DeadlineArrays(deadlines)
+    state = {"now": now}
+
+    def refresh():
+        current_time = state["now"]
+        status = arrays.evaluate(current_time)
+
+        def row(index):
+            deadline = deadlines[index]
+            values = cache.row_values(deadline, current_time, lambda: status.remaining_text(index))
+            return deadline.id, values, ("urgent",) if status.highlighted(index) else ()
+
+        sync.sync(row(index) for index in range(len(deadlines)))
+        state["now"] = current_time + timedelta(minutes=1)
+
+    # Первое заполнение списка не входит в замер
+    refresh()
+    return refresh
+
+
+BENCHMARKS = {
+    "file_save": _bench_file_save,
+    "file_load": _bench_file_load,
+    "from_dict": _bench_from_dict,
+    "jsonl_load": _bench_jsonl_load,
+    "jsonl_load_parallel": _bench_jsonl_load_parallel,
+    "urgency_loop": _bench_urgency_loop,
+    "urgency_report": _bench_urgency_report,
+    "urgency_parallel": _bench_urgency_parallel,
+    "urgency_batch": _bench_urgency_batch,
+    "range_query": _bench_range_query,
+    "search": _bench_search,
+    "search_keystroke": _bench_search_keystroke,
+    "display_refresh": _bench_display_refresh,
+}
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def measure(name, deadlines, repeats, workdir):
+    """Время прогонов и пиковая память одной операции"""
+    now = deadlines[0].created + timedelta(days=100) if deadlines else None
+    operation = BENCHMARKS[name](deadlines, workdir, now)
+    operation()  # прогрев
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = _percentile(timings, 50)
+    return {
+        "throughput": len(deadlines) / median if median > 0 else float("inf"),
+        "p50_ms": median * 1000,
+        "p95_ms": _percentile(timings, 95) * 1000,
+        "p99_ms": _percentile(timings, 99) * 1000,
+        "min_ms": min(timings) * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+
+def _baseline_path(profile):
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности deadline_tracker")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить результаты как базу")
+    parser.add_argument("--compare", action="store_true", help="сравнить с сохраненной базой")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="допустимое замедление лучшего прогона относительно базы (0.25 = 25%%)")
+    parser.add_argument("--floor-ms", type=float, default=0.5,
+                        help="замедление меньше этого числа миллисекунд не считается регрессией")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    try:
+        with open(_baseline_path(args.profile), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except OSError:
+        if args.compare:
+            print(f"База {_baseline_path(args.profile)} не найдена")
+            return 2
+
+    results = {}
+    regressions = []
+    print(f"{'операция':<26} {'размер':>8} {'дедл./с':>12} {'p50 мс':>10} {'p95 мс':>10} "
+          f"{'p99 мс':>10} {'пик КБ':>10}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            deadlines = generate_deadlines(size, profile=args.profile)
+            for name in args.only:
+                result = measure(name, deadlines, args.repeats, workdir)
+                results.setdefault(name, {})[str(size)] = result
+
+                line = (f"{name:<26} {size:>8} {result['throughput']:>12.0f} {result['p50_ms']:>10.2f} "
+                        f"{result['p95_ms']:>10.2f} {result['p99_ms']:>10.2f} {result['peak_kb']:>10.0f}")
+
+                base = baseline.get(name, {}).get(str(size))
+                if base and args.compare:
+                    # В старых базах нет min_ms: тогда сравниваем медианы
+                    metric = "min_ms" if "min_ms" in base else "p50_ms"
+                    ratio = result[metric] / base[metric] if base[metric] else 1.0
+                    line += f"  x{ratio:.2f} к базе"
+                    if (ratio > 1 + args.tolerance
+                            and result[metric] - base[metric] > args.floor_ms):
+                        regressions.append(f"{name} ({size}): x{ratio:.2f}")
+                print(line, flush=True)
+
+    if args.save_baseline:
+        # Замеры, которые не запускались, остаются в базе прежними
+        for name, sizes in results.items():
+            baseline.setdefault(name, {}).update(sizes)
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(_baseline_path(args.profile), "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"База сохранена: {_baseline_path(args.profile)}")
+
+    if regressions:
+        print("Замедление относительно базы: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
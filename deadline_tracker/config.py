@@ -1,3 +1,5 @@
+# Модуль не зависит от остального пакета: daily_notification.py
+# импортирует его как deadline_tracker.config
 import os
 
 # Настройки приложения
@@ -5,12 +7,70 @@ APP_TITLE = "Трекер дедлайнов"
 APP_GEOMETRY = "750x450"
 DATA_FILE = "deadlines.json"
 
+# Настройки хранилища
+# "json", "journal", "jsonl" (deadlines.jsonl) или "sqlite" (deadlines.db);
+# jsonl и sqlite при первом запуске переносят данные из DATA_FILE
+STORAGE_BACKEND = "json"
+JOURNAL_COMPACT_THRESHOLD = 500  # записей в журнале до фонового сжатия
+SAVE_DEBOUNCE_MS = 500  # пауза без изменений, после которой они сохраняются одной записью
+SAVE_MAX_DELAY_MS = 3000  # дольше этого сохранение при непрерывных изменениях не откладывается
+SAVE_CLOSE_ATTEMPTS = 3  # попыток записи при закрытии, после которых изменения считаются потерянными
+SAVE_CLOSE_TIMEOUT_MS = 10000  # дольше этого закрытие не ждет поток записи
+SNAPSHOT_CACHE = True  # двоичный снимок разобранных данных (<файл данных>.cache) для быстрого запуска
+FIRST_PAGE_SIZE = 100  # ближайших дедлайнов, показываемых до окончания загрузки (jsonl и sqlite)
+LOAD_CHECK_MS = 50  # как часто окно проверяет, закончилась ли фоновая загрузка
+
+# Отслеживание изменений файла данных другими программами (utils/file_watcher.py)
+FILE_WATCH = True
+FILE_WATCH_INTERVAL = 2  # секунд между опросами файлов, если inotify недоступен
+FILE_WATCH_SETTLE_MS = 200  # тишина после событий, после которой файл перечитывается
+FILE_WATCH_CHECK_MS = 500  # как часто окно забирает найденные изменения
+FILE_WATCH_MAX_CONFLICTS_SHOWN = 20  # названий в вопросе о конфликте
+
+# Параллельная обработка больших наборов (utils/parallel.py)
+PARALLEL_WORKERS = None  # процессов в пуле; None - по числу доступных ядер
+PARALLEL_THRESHOLD = 50000  # дедлайнов, меньше которых все считается в одном процессе
+PARALLEL_CHUNK_SIZE = 25000  # дедлайнов в одной части
+PARALLEL_CHUNK_BYTES = 4 * 1024 * 1024  # байт файла JSON Lines в одной части
+# Проверять строки больших импортов (от PARALLEL_THRESHOLD) в пуле процессов.
+# Выключено: ускорения на двух ядрах не измерено, а запуск пула стоит секунды
+PARALLEL_IMPORT = False
+
+# Импорт из CSV и iCalendar (utils/importer.py)
+IMPORT_BATCH_SIZE = 1000  # строк файла, проверяемых за один проход
+IMPORT_MAX_ERRORS_SHOWN = 20  # ошибок в итоговом сообщении, остальные только считаются
+IMPORT_CHECK_MS = 100  # как часто окно проверяет, закончился ли фоновый импорт
+
 # Настройки обновления
 UPDATE_INTERVAL = 60000  # 1 минута в миллисекундах
+URGENCY_MAX_SLEEP = 3600000  # не дольше часа до следующей проверки переходов срочности
+
+# Настройки списка
+VIEW_MODE = "auto"  # "full", "virtual" или "auto" (виртуальный список для больших наборов)
+VIRTUAL_VIEW_THRESHOLD = 5000  # дедлайнов, начиная с которых "auto" включает виртуальный список
+VIRTUAL_OVERSCAN = 20  # строк, создаваемых сверху и снизу от видимой области
+RENDER_CACHE_SIZE = 50000  # строк в кэше отформатированных ячеек
 
 # Настройки уведомлений
 NOTIFICATION_TIMEOUT = 10  # секунд
 NOTIFICATION_COOLDOWN = 3600  # 1 час в секундах
+COOLDOWN_FILE = "notification_state.json"  # время последних уведомлений между запусками
+NOTIFICATION_QUEUE_SIZE = 100  # уведомлений в очереди, лишние отбрасываются
+NOTIFICATION_BACKEND_TIMEOUT = 15  # секунд, после которых способ доставки считается зависшим
+NOTIFICATION_BACKEND_MAX_FAILURES = 3  # ошибок подряд до временного отключения способа доставки
+NOTIFICATION_BACKEND_RETRY = 300  # секунд до повторной попытки после отключения
+NOTIFICATION_RATE_LIMIT = 5  # уведомлений (отдельных и сводок) за окно NOTIFICATION_RATE_WINDOW
+NOTIFICATION_RATE_WINDOW = 600  # секунд
+NOTIFICATION_DIGEST_MAX_NAMES = 5  # названий в тексте сводки, остальные только считаются
+
+# Настройки демона уведомлений (daemon.py)
+DAEMON_RELOAD_INTERVAL = 30  # секунд между проверками файла данных на изменения
+
+# Метрики (utils/metrics.py)
+METRICS_ENABLED = False  # замеры времени горячих участков; выключенные почти ничего не стоят
+METRICS_FILE = "metrics.prom"  # текстовый формат Prometheus (node_exporter textfile)
+METRICS_EXPORT_INTERVAL = 60  # секунд между записью файла и строкой сводки
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)  # секунд
 
 # Цвета
 URGENT_COLOR = "#ffcccc"
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Фоновый процесс уведомлений без графического интерфейса.
+
+    python -m deadline_tracker.daemon    # из корня репозитория
+    python daemon.py                     # из каталога deadline_tracker
+
+Читает то же хранилище, что и окно (config.STORAGE_BACKEND, config.DATA_FILE),
+и спит до ближайшего события: перехода дедлайна в срочные, повторного
+уведомления или проверки файла данных на изменения. tkinter не загружается.
+
+Хранилище с индексом (SQLite) список целиком не загружает: срочные
+дедлайны и время следующего перехода запрашиваются у него при каждой
+проверке. Для файловых хранилищ весь список читается при изменении файла
+и переходы считает UrgencyScheduler.
+"""
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Модули приложения импортируются относительно каталога deadline_tracker
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.store import create_store  # noqa: E402
+from utils.notifications import NotificationManager  # noqa: E402
+from utils.urgency_scheduler import UrgencyScheduler, URGENT  # noqa: E402
+from utils.metrics import metrics  # noqa: E402
+import config  # noqa: E402
+
+
+class NotifierDaemon:
+    def __init__(self, store=None, notification_manager=None):
+        self.store = store or create_store(config.STORAGE_BACKEND, config.DATA_FILE)
+        self.notification_manager = notification_manager or NotificationManager()
+        self.urgency_scheduler = UrgencyScheduler()
+        self.stop_event = threading.Event()
+        self._files_signature = None
+        self._urgent = []  # срочные дедлайны последней проверки
+        self._urgent_ids = None  # их ключи (для хранилища с индексом)
+
+    def watched_files(self):
+        """Файлы хранилища, изменение которых означает, что данные нужно перечитать"""
+        paths = [getattr(self.store, "filename", None), getattr(self.store, "journal_filename", None)]
+        return [path for path in paths if path]
+
+    def files_signature(self):
+        signature = []
+        for path in self.watched_files():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def reload_if_changed(self, current_time) -> bool:
+        """Перечитывает хранилище, если его файлы изменились"""
+        signature = self.files_signature()
+        if signature == self._files_signature:
+            return False
+
+        self._files_signature = signature
+        deadlines = self.store.load_deadlines()
+        self.urgency_scheduler.rebuild(deadlines, current_time)
+        self.notification_manager.save_state(current_time, {d.id for d in deadlines})
+        print(f"Загружено дедлайнов: {len(deadlines)}, срочных: {len(self.urgency_scheduler.urgent)}")
+        return True
+
+    def next_reminder_time(self):
+        """Когда истечет ближайший интервал между повторными уведомлениями"""
+        cooldown = timedelta(seconds=config.NOTIFICATION_COOLDOWN)
+        cooldowns = self.notification_manager.cooldowns
+        times = [cooldowns.get(deadline.id) + cooldown
+                 for deadline in self._urgent
+                 if deadline.id in cooldowns]
+        return min(times) if times else None
+
+    def query_urgent(self, current_time):
+        """Срочные дедлайны по индексу хранилища и ключи ставших срочными с прошлой проверки"""
+        self._urgent = self.store.urgent_deadlines(current_time)
+        ids = {deadline.id for deadline in self._urgent}
+        newly_urgent = ids - self._urgent_ids if self._urgent_ids is not None else set()
+        self._urgent_ids = ids
+        return newly_urgent
+
+    def tick(self, current_time):
+        """Обрабатывает все наступившие события"""
+        if self.store.indexed:
+            newly_urgent = self.query_urgent(current_time)
+        else:
+            self.reload_if_changed(current_time)
+            newly_urgent = {deadline.id for deadline, kind in self.urgency_scheduler.pop_due(current_time)
+                            if kind == URGENT}
+            self._urgent = self.urgency_scheduler.urgent_deadlines()
+
+        # Только что ставшие срочными и те, у кого истек интервал между уведомлениями
+        self.notification_manager.notify_urgent(self._urgent, current_time, newly_urgent)
+        self.notification_manager.save_state(current_time)
+
+    def next_transition_time(self, current_time):
+        if self.store.indexed:
+            return self.store.next_urgent_time(current_time)
+        return self.urgency_scheduler.next_transition_time()
+
+    def seconds_until_next_event(self, current_time) -> float:
+        candidates = [current_time + timedelta(seconds=config.DAEMON_RELOAD_INTERVAL)]
+        for event_time in (self.next_transition_time(current_time), self.next_reminder_time()):
+            if event_time is not None:
+                candidates.append(event_time)
+        return max(0.0, (min(candidates) - current_time).total_seconds())
+
+    def run(self):
+        print("Демон уведомлений запущен")
+        metrics.start_exporter()
+        while not self.stop_event.is_set():
+            current_time = datetime.now()
+            self.tick(current_time)
+            self.stop_event.wait(self.seconds_until_next_event(current_time))
+
+        self.notification_manager.close()
+        self.store.close()
+        metrics.stop_exporter()
+        print("Демон уведомлений остановлен")
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+
+def main():
+    daemon = NotifierDaemon()
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
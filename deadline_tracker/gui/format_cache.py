@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import config
+
+
+def format_static_cells(deadline):
+    """Ячейки, которые меняются только при редактировании дедлайна"""
+    days_needed_str = str(deadline.days_needed) if deadline.days_needed is not None else ""
+    return (
+        deadline.name,
+        deadline.deadline.strftime("%d.%m.%Y %H:%M"),
+        days_needed_str
+    )
+
+
+class RenderCache:
+    """Кэш отформатированных ячеек Treeview.
+
+    Название, дата и дни на выполнение форматируются один раз и хранятся
+    до редактирования дедлайна, а строка "Осталось времени" - до смены
+    минуты. Записи вытесняются по давности использования (LRU).
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size or config.RENDER_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        # ключ дедлайна -> [исходные данные, статичные ячейки, минута, оставшееся время]
+        self._entries = OrderedDict()
+
+    def row_values(self, deadline, current_time, remaining_func):
+        """Значения строки; remaining_func вызывается, только если минута сменилась"""
+        key = deadline.id
+        source = (deadline.name, deadline.deadline, deadline.days_needed)
+        minute = current_time.replace(second=0, microsecond=0)
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != source:
+            # Новый или отредактированный дедлайн
+            entry = [source, format_static_cells(deadline), minute, remaining_func()]
+            self._entries[key] = entry
+            self.misses += 1
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+            if entry[2] != minute:
+                entry[2] = minute
+                entry[3] = remaining_func()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return entry[1] + (entry[3],)
+
+    def invalidate(self, key):
+        """Забывает ячейки дедлайна (после редактирования, удаления или смены состояния)"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,11 +1,28 @@
+import contextlib
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from dataclasses import replace
 from datetime import datetime
 
-from gui.widgets import DeadlineInputFrame
-from utils.file_manager import FileManager
+from gui.widgets import DeadlineInputFrame, SearchFrame
+from gui.tree_sync import TreeviewSync
+from gui.virtual_list import VirtualTreeview
+from gui.format_cache import RenderCache
+from utils.store import create_store
+from utils.persistence_writer import DebouncedStoreWriter
+from utils.snapshot_cache import CachedStore
+from utils.file_watcher import FileWatcher
+from utils.live_reload import DiskState, plan_merge
 from utils.notifications import NotificationManager
+from utils.urgency_scheduler import UrgencyScheduler, URGENT
+from utils.importer import import_file
+from utils.search_index import NameSearchIndex, SearchFilter
+from utils.metrics import metrics
+from utils.timers import TimerRegistry
 from models.deadline import Deadline
+from models.sorted_deadlines import SortedDeadlines
 import config
 
 
@@ -15,19 +32,59 @@ class MainWindow:
         self.root.title(config.APP_TITLE)
         self.root.geometry(config.APP_GEOMETRY)
 
-        self.deadlines = []
-        self.file_manager = FileManager()
+        self.deadlines = SortedDeadlines()
+        self.deadlines_by_id = {}
+        # Запись на диск идет в фоновом потоке и не задерживает интерфейс
+        store = create_store(config.STORAGE_BACKEND, config.DATA_FILE)
+        # Изменения файла другими программами подхватываются без перезапуска
+        self.disk_state = DiskState(store.record_reader())
+        self._external_changes = queue.Queue()
+        self._import_results = queue.Queue()
+        self._importing = False
+        self._loaded = queue.Queue()
+        self._loading = False
+        self.file_watcher = None
+        write_guard = None
+        if config.FILE_WATCH:
+            self.file_watcher = FileWatcher(
+                [getattr(store, "filename", None), getattr(store, "journal_filename", None)],
+                self.on_files_changed)
+            write_guard = self.own_write
+        if config.SNAPSHOT_CACHE:
+            store = CachedStore(store)
+        self.store = DebouncedStoreWriter(store, write_guard=write_guard)
         self.notification_manager = NotificationManager()
-
-        self.load_data()
+        self.urgency_scheduler = UrgencyScheduler()
+        # Все отложенные вызовы окна - именованные таймеры, не больше одного на имя
+        self.timers = TimerRegistry(self.root)
+        metrics.gauge("pending_timers", self.timers.pending)
+        metrics.gauge("coalesced_refreshes", lambda: self.timers.coalesced)
+        self._deadline_arrays = None
+        self.render_cache = RenderCache()
+        self.search_index = NameSearchIndex()
+        self.search_filter = SearchFilter(self.search_index)
+        self.search_query = ""
+
+        metrics.start_exporter()
         self.create_widgets()
-        self.update_display()
+
+        # Первый кадр рисуется до загрузки и разбора данных, весь список загружается в фоне
+        self.root.title(f"{config.APP_TITLE} - загрузка...")
+        self.root.update()
+        self.show_first_page()
+        self.start_loading()
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def create_widgets(self):
         # Frame для добавления новых дедлайнов
         self.input_frame = DeadlineInputFrame(self.root, self.add_deadline)
         self.input_frame.grid(row=0, column=0, sticky="ew")
 
+        # Поиск по названию
+        self.search_frame = SearchFrame(self.root, self.on_search_changed)
+        self.search_frame.grid(row=1, column=0, sticky="ew", padx=10)
+
         # Treeview для отображения дедлайнов
         self.create_treeview()
 
@@ -35,12 +92,23 @@ class MainWindow:
         self.create_control_buttons()
 
         # Настройка растягивания
-        self.root.grid_rowconfigure(1, weight=1)
+        self.root.grid_rowconfigure(2, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
 
     def create_treeview(self):
         columns = ("name", "deadline", "days_needed", "remaining")
-        self.tree = ttk.Treeview(self.root, columns=columns, show="headings", height=15)
+
+        # Для больших наборов создаются только видимые строки
+        if self.use_virtual_view():
+            self.virtual_view = VirtualTreeview(self.root, columns, height=15)
+            self.virtual_view.grid(row=2, column=0, sticky="nsew", padx=10, pady=10)
+            self.tree = self.virtual_view.tree
+            self.tree_sync = self.virtual_view.sync
+        else:
+            self.virtual_view = None
+            self.tree = ttk.Treeview(self.root, columns=columns, show="headings", height=15)
+            self.tree.grid(row=2, column=0, sticky="nsew", padx=10, pady=10)
+            self.tree_sync = TreeviewSync(self.tree)
 
         self.tree.heading("name", text="Название")
         self.tree.heading("deadline", text="Дедлайн")
@@ -52,26 +120,50 @@ class MainWindow:
         self.tree.column("days_needed", width=120)
         self.tree.column("remaining", width=180)
 
-        self.tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         self.tree.tag_configure("urgent", background=config.URGENT_COLOR)
 
+    def update_view_mode(self):
+        """Пересоздает список, если после загрузки нужен другой режим (полный или виртуальный)"""
+        if self.use_virtual_view() == (self.virtual_view is not None):
+            return
+        (self.virtual_view or self.tree).destroy()
+        self.create_treeview()
+
+    def use_virtual_view(self) -> bool:
+        """Нужен ли виртуальный список (config.VIEW_MODE)"""
+        if config.VIEW_MODE == "auto":
+            return len(self.deadlines) >= config.VIRTUAL_VIEW_THRESHOLD
+        return config.VIEW_MODE == "virtual"
+
     def create_control_buttons(self):
         button_frame = ttk.Frame(self.root)
-        button_frame.grid(row=2, column=0, pady=5)
+        button_frame.grid(row=3, column=0, pady=5)
 
         ttk.Button(button_frame, text="Удалить выбранный",
                    command=self.delete_deadline).grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Изменить выбранный",
                    command=self.edit_deadline).grid(row=0, column=1, padx=5)
-
-    def get_selected_deadline_index(self):
-        """Получить индекс выбранного дедлайна"""
-        selected = self.tree.selection()
-        if not selected:
-            return -1
-        return self.tree.index(selected[0])
+        ttk.Button(button_frame, text="Импорт...",
+                   command=self.import_deadlines).grid(row=0, column=2, padx=5)
+
+    def get_selected_deadline(self):
+        """Выбранный дедлайн или None (iid строки treeview - id дедлайна)"""
+        if self.virtual_view is not None:
+            selected_iid = self.virtual_view.selected_iid()
+        else:
+            selected = self.tree.selection()
+            selected_iid = selected[0] if selected else None
+        return self.deadlines_by_id.get(selected_iid)
+
+    def loading_in_progress(self) -> bool:
+        """Идет ли загрузка списка; правки до ее окончания недоступны"""
+        if self._loading:
+            messagebox.showinfo("Загрузка", "Список еще загружается, повторите через несколько секунд")
+        return self._loading
 
     def add_deadline(self):
+        if self.loading_in_progress():
+            return
         input_data = self.input_frame.get_input_data()
         name = input_data["name"]
         date_str = input_data["date"]
@@ -111,23 +203,95 @@ class MainWindow:
                 deadline=deadline_date,
                 days_needed=days_needed
             )
-            self.deadlines.append(deadline)
+            self.insert_deadline(deadline)
+            self._deadline_arrays = None
 
             # Очищаем поля ввода
             self.input_frame.clear_inputs()
 
-            self.file_manager.save_deadlines(self.deadlines)
-            self.update_display()
+            self.store.add_deadline(deadline, self.deadlines)
+            self.request_refresh()
             messagebox.showinfo("Успех", "Дедлайн добавлен!")
 
         except ValueError as e:
             messagebox.showerror("Ошибка",
                                  f"Неправильный формат даты/времени!\nИспользуйте: ММ-ДД и ЧЧ-ММ\nОшибка: {e}")
 
+    def import_deadlines(self):
+        """Импорт дедлайнов из CSV или iCalendar: одна запись в хранилище и одно обновление списка.
+
+        Файл читается и проверяется в фоновом потоке, окно в это время
+        отвечает; результат забирает check_import.
+        """
+        if self.loading_in_progress():
+            return
+        if self._importing:
+            messagebox.showinfo("Импорт", "Предыдущий импорт еще не закончен")
+            return
+        filename = filedialog.askopenfilename(
+            parent=self.root,
+            title="Импорт дедлайнов",
+            filetypes=[("CSV и iCalendar", "*.csv *.ics"), ("CSV", "*.csv"),
+                       ("iCalendar", "*.ics"), ("Все файлы", "*.*")]
+        )
+        if not filename:
+            return
+
+        # Повторы ищутся по копии списка: сам список меняется в потоке окна
+        existing = self.deadlines[:]
+
+        def run():
+            try:
+                self._import_results.put(import_file(filename, existing))
+            except Exception as e:
+                self._import_results.put(e)
+
+        self._importing = True
+        self.root.title(f"{config.APP_TITLE} - импорт...")
+        threading.Thread(target=run, name="import", daemon=True).start()
+        self.timers.schedule("import", config.IMPORT_CHECK_MS, self.check_import)
+
+    def check_import(self):
+        """Применяет результат фонового импорта, когда он готов"""
+        try:
+            result = self._import_results.get_nowait()
+        except queue.Empty:
+            self.timers.schedule("import", config.IMPORT_CHECK_MS, self.check_import)
+            return
+        self._importing = False
+        self.root.title(config.APP_TITLE)
+        if isinstance(result, Exception):
+            messagebox.showerror("Ошибка", f"Не удалось прочитать файл:\n{result}")
+            return
+
+        if result.deadlines:
+            self.deadlines.extend(result.deadlines)
+            for deadline in result.deadlines:
+                self.deadlines_by_id[deadline.id] = deadline
+                self.search_index.add(deadline)
+                self.urgency_scheduler.schedule(deadline)
+            self._deadline_arrays = None
+            self.store.apply_changes([("put", d) for d in result.deadlines], self.deadlines)
+            self.request_refresh()
+
+        message = f"Импортировано дедлайнов: {len(result.deadlines)}"
+        if result.duplicates:
+            message += f"\nПропущено повторов: {result.duplicates}"
+        if result.errors:
+            shown = result.errors[:config.IMPORT_MAX_ERRORS_SHOWN]
+            message += f"\nСтрок с ошибками: {len(result.errors)}\n\n" + "\n".join(map(str, shown))
+            if len(result.errors) > len(shown):
+                message += "\n..."
+            messagebox.showwarning("Импорт", message)
+        else:
+            messagebox.showinfo("Импорт", message)
+
     def edit_deadline(self):
         """Редактирование выбранного дедлайна"""
-        index = self.get_selected_deadline_index()
-        if index == -1:
+        if self.loading_in_progress():
+            return
+        deadline = self.get_selected_deadline()
+        if deadline is None:
             messagebox.showwarning("Внимание", "Выберите дедлайн для редактирования!")
             return
 
@@ -138,9 +302,6 @@ class MainWindow:
         edit_window.transient(self.root)
         edit_window.grab_set()
 
-        # Получаем данные выбранного дедлайна
-        deadline = self.deadlines[index]
-
         # Поля для редактирования
         ttk.Label(edit_window, text="Название:").grid(row=0, column=0, padx=10, pady=10, sticky="w")
         name_entry = ttk.Entry(edit_window, width=30)
@@ -214,13 +375,22 @@ class MainWindow:
                         messagebox.showerror("Ошибка", "Количество дней должно быть числом!")
                         return
 
-                # Обновляем данные
-                self.deadlines[index].name = new_name
-                self.deadlines[index].deadline = new_deadline_date
-                self.deadlines[index].days_needed = new_days_needed
+                # Пока окно было открыто, дедлайн могла изменить другая программа
+                current = self.deadlines_by_id.get(deadline.id)
+                if current is None:
+                    messagebox.showerror("Ошибка", "Дедлайн удален другой программой!")
+                    edit_window.destroy()
+                    return
+
+                # Обновляем данные копией: старый дедлайн может еще читать поток записи
+                updated = replace(deadline, name=new_name, deadline=new_deadline_date,
+                                  days_needed=new_days_needed)
+                self.discard_deadline(current)
+                self.insert_deadline(updated)
+                self._deadline_arrays = None
 
-                self.file_manager.save_deadlines(self.deadlines)
-                self.update_display()
+                self.store.update_deadline(updated, self.deadlines)
+                self.request_refresh()
                 edit_window.destroy()
                 messagebox.showinfo("Успех", "Дедлайн обновлен!")
 
@@ -237,26 +407,46 @@ class MainWindow:
                    command=edit_window.destroy).grid(row=0, column=1, padx=10)
 
     def delete_deadline(self):
-        index = self.get_selected_deadline_index()
-        if index == -1:
+        if self.loading_in_progress():
+            return
+        deadline = self.get_selected_deadline()
+        if deadline is None:
             messagebox.showwarning("Внимание", "Выберите дедлайн для удаления!")
             return
 
         # Подтверждение удаления
-        deadline_name = self.deadlines[index].name
+        deadline_name = deadline.name
         result = messagebox.askyesno(
             "Подтверждение удаления",
             f"Вы уверены, что хотите удалить дедлайн:\n\"{deadline_name}\"?"
         )
 
         if result:
-            del self.deadlines[index]
-            self.file_manager.save_deadlines(self.deadlines)
-            self.update_display()
-
-    def calculate_time_remaining(self, deadline):
+            self.discard_deadline(deadline)
+            self.notification_manager.forget(deadline.id)
+            self._deadline_arrays = None
+            self.store.delete_deadline(deadline, self.deadlines)
+            self.request_refresh()
+
+    def insert_deadline(self, deadline):
+        """Добавляет дедлайн в список и индексы (без записи в хранилище)"""
+        self.deadlines.add(deadline)
+        self.deadlines_by_id[deadline.id] = deadline
+        self.search_index.add(deadline)
+        self.urgency_scheduler.schedule(deadline)
+
+    def discard_deadline(self, deadline):
+        """Убирает дедлайн из списка и индексов (без записи в хранилище)"""
+        del self.deadlines_by_id[deadline.id]
+        self.deadlines.remove(deadline)
+        self.search_index.remove(deadline)
+        self.urgency_scheduler.remove(deadline)
+        self.render_cache.invalidate(deadline.id)
+
+    def calculate_time_remaining(self, deadline, now=None):
         """Рассчитать оставшееся время до дедлайна"""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         difference = deadline.deadline - now
 
         if difference.total_seconds() <= 0:
@@ -268,48 +458,284 @@ class MainWindow:
 
         time_str = f"{days} дн. {hours} ч. {minutes} мин."
 
-        # Проверяем нужно ли подсвечивать красным
-        is_urgent = deadline.is_urgent(now)
+        # Срочность известна планировщику, пересчитывать её не нужно
+        is_urgent = self.urgency_scheduler.is_urgent(deadline)
 
         return time_str, is_urgent
 
+    def build_row(self, deadline, current_time, remaining_func, is_urgent):
+        """Строка treeview для дедлайна: (iid, значения, теги)"""
+        # Ячейки берутся из кэша, remaining_func вызывается раз в минуту
+        values = self.render_cache.row_values(deadline, current_time, remaining_func)
+
+        # Подсвечиваем красным если срочно или просрочено
+        tags = ("urgent",) if is_urgent else ()
+        return deadline.id, values, tags
+
+    def build_row_at(self, deadline, current_time):
+        """Строка treeview для одного дедлайна на момент current_time"""
+        remaining, is_urgent = self.calculate_time_remaining(deadline, current_time)
+        self.render_cache.invalidate(deadline.id)
+        return self.build_row(deadline, current_time, lambda: remaining, is_urgent)
+
+    def get_deadline_arrays(self):
+        """Массивы для пакетного расчета; пересоздаются после изменения списка"""
+        if self._deadline_arrays is None:
+            # NumPy загружается при первом расчете, а не при запуске
+            from utils.batch_urgency import DeadlineArrays
+            self._deadline_arrays = DeadlineArrays(self.deadlines)
+        return self._deadline_arrays
+
+    @metrics.timed("update_display")
     def update_display(self):
-        # Очищаем treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Сортируем по дате дедлайна
-        self.deadlines.sort(key=lambda x: x.deadline)
-
+        # Это обновление выполняет и ожидающий запрос request_refresh
+        self.timers.cancel("refresh_now")
+        # self.deadlines всегда упорядочен по дате, сортировать его не нужно
         current_time = datetime.now()
+        newly_urgent = set()
+        for deadline, kind in self.urgency_scheduler.pop_due(current_time):
+            self.render_cache.invalidate(deadline.id)
+            if kind == URGENT:
+                newly_urgent.add(deadline.id)
+
+        # Срочность и оставшееся время всех дедлайнов - одним векторным расчетом
+        status = self.get_deadline_arrays().evaluate(current_time)
+        self.refresh_rows(current_time, status)
+
+        # Повторные уведомления нужны только срочным дедлайнам; за проход - одна сводка
+        deadlines = self.deadlines
+        self.notification_manager.notify_urgent(
+            (deadlines[index] for index in status.urgent_indices()), current_time, newly_urgent)
+        self.notification_manager.save_state(current_time)
+
+        self.schedule_urgency_check()
+
+        # Обновляем каждую минуту; прежний таймер заменяется, а не дублируется
+        self.timers.schedule("refresh", config.UPDATE_INTERVAL, self.update_display)
+
+    def request_refresh(self):
+        """Обновление после изменения списка; запросы до его выполнения сливаются в один"""
+        self.timers.request("refresh_now", self.update_display)
+
+    def refresh_rows(self, current_time, status=None):
+        """Сверяет строки treeview с дедлайнами, подходящими под поиск.
+
+        status - пакетный расчет из update_display. Без него (ввод в строке
+        поиска, внешние изменения) время считается только для строк, которые
+        действительно строятся: видимых в виртуальном списке или найденных.
+        """
+        deadlines = self.deadlines
+        if status is not None:
+            def row(index):
+                return self.build_row(deadlines[index], current_time,
+                                      lambda: status.remaining_text(index), status.highlighted(index))
+        else:
+            def row(index):
+                deadline = deadlines[index]
+                highlighted = deadline.deadline <= current_time or self.urgency_scheduler.is_urgent(deadline)
+                return self.build_row(deadline, current_time,
+                                      lambda: self.calculate_time_remaining(deadline, current_time)[0],
+                                      highlighted)
+
+        visible = self.search_filter.positions(self.search_query, deadlines)
+
+        # Обновляем только изменившиеся строки
+        if self.virtual_view is not None:
+            self.virtual_view.set_rows(len(visible), lambda position: row(visible[position]))
+        else:
+            self.tree_sync.sync(row(index) for index in visible)
+
+    def on_search_changed(self, query):
+        """Фильтрует список при каждом изменении строки поиска"""
+        self.search_query = query
+        self.refresh_rows(datetime.now())
+
+    def schedule_urgency_check(self):
+        """Планирует пробуждение точно к ближайшему переходу срочности"""
+        next_time = self.urgency_scheduler.next_transition_time()
+        if next_time is None:
+            self.timers.cancel("urgency")
+            return
 
-        # Добавляем дедлайны в treeview
-        for deadline in self.deadlines:
-            remaining, is_urgent = self.calculate_time_remaining(deadline)
-
-            # Форматируем дни на выполнение
-            days_needed_str = str(deadline.days_needed) if deadline.days_needed is not None else ""
+        delay = (next_time - datetime.now()).total_seconds() * 1000
+        delay = int(min(max(delay, 0), config.URGENCY_MAX_SLEEP)) + 1
+        self.timers.schedule("urgency", delay, self.on_urgency_transition)
 
-            item = self.tree.insert("", "end", values=(
-                deadline.name,
-                deadline.deadline.strftime("%d.%m.%Y %H:%M"),
-                days_needed_str,
-                remaining
-            ))
+    def on_urgency_transition(self):
+        """Обрабатывает наступившие переходы: обновляет их строки и уведомляет"""
+        current_time = datetime.now()
 
-            # Подсвечиваем красным если срочно или просрочено
-            if is_urgent or "ПРОСРОЧЕНО" in remaining:
-                self.tree.item(item, tags=("urgent",))
+        urgent = []
+        for deadline, kind in self.urgency_scheduler.pop_due(current_time):
+            self.tree_sync.update_row(*self.build_row_at(deadline, current_time))
+            if kind == URGENT:
+                urgent.append(deadline)
+        self.notification_manager.notify_urgent(urgent, current_time, {d.id for d in urgent})
+        self.notification_manager.save_state(current_time)
 
-                # Отправляем уведомление для срочных дедлайнов
-                if is_urgent and deadline.days_needed is not None:
-                    if self.notification_manager.should_send_notification(deadline.name, current_time):
-                        self.notification_manager.send_urgent_notification(deadline)
-                        self.notification_manager.update_notification_time(deadline.name, current_time)
+        self.schedule_urgency_check()
 
-        # Обновляем каждую минуту
-        self.root.after(config.UPDATE_INTERVAL, self.update_display)
+    def start_file_watch(self):
+        """Запускает наблюдение за файлом данных и проверку найденных изменений"""
+        if self.file_watcher is None:
+            return
+        self.file_watcher.start()
+        # Первое чтение запоминает состояние диска, с которым сравниваются следующие
+        threading.Thread(target=self.on_files_changed, name="disk-state", daemon=True).start()
+        self.timers.schedule("file_watch", config.FILE_WATCH_CHECK_MS, self.check_external_changes)
+
+    @contextlib.contextmanager
+    def own_write(self):
+        """Запись окна на диск (в потоке записи): после нее записанные
+        дедлайны считаются прочитанными, иначе следующее внешнее изменение
+        вернуло бы их как чужие и дало ложные конфликты"""
+        with self.file_watcher.own_write():
+            try:
+                yield
+            finally:
+                changes = self.disk_state.refresh(own_keys=self.store.writing_ids())
+                # Чужие изменения, сделанные одновременно с записью
+                if changes is not None and (changes.changed or changes.deleted):
+                    self._external_changes.put(changes)
+
+    def on_files_changed(self):
+        """Перечитывает файл данных (в фоновом потоке) и передает изменения окну"""
+        changes = self.disk_state.refresh()
+        if changes is not None and (changes.changed or changes.deleted):
+            self._external_changes.put(changes)
+
+    def check_external_changes(self):
+        """Применяет изменения, найденные наблюдателем, и планирует следующую проверку"""
+        while True:
+            try:
+                changes = self._external_changes.get_nowait()
+            except queue.Empty:
+                break
+            self.merge_external_changes(changes)
+        # Следующая проверка - после диалога о конфликте, если он был
+        self.timers.schedule("file_watch", config.FILE_WATCH_CHECK_MS, self.check_external_changes)
+
+    def merge_external_changes(self, changes):
+        """Вносит внешние изменения в список; о конфликтах с несохраненными правками спрашивает"""
+        plan = plan_merge(changes, self.deadlines_by_id, self.store.pending_ids())
+        puts, deletes = list(plan.puts), list(plan.deletes)
+
+        if plan.conflicts:
+            names = [(local or disk).name for local, disk in plan.conflicts]
+            shown = "\n".join(names[:config.FILE_WATCH_MAX_CONFLICTS_SHOWN])
+            if len(names) > config.FILE_WATCH_MAX_CONFLICTS_SHOWN:
+                shown += "\n..."
+            keep_local = messagebox.askyesno(
+                "Файл данных изменен",
+                "Другая программа изменила дедлайны, у которых есть несохраненные правки:\n"
+                f"{shown}\n\nОставить ваши версии? (Нет - взять версии из файла)"
+            )
+            if not keep_local:
+                for local, disk in plan.conflicts:
+                    if disk is not None:
+                        puts.append(disk)
+                    elif local is not None:
+                        deletes.append(local)
+
+        # Пока шел диалог, дедлайн могли изменить или удалить в окне
+        deletes = [d for d in deletes if self.deadlines_by_id.get(d.id) is d]
+        if not puts and not deletes:
+            return
 
-    def load_data(self):
-        """Загружает данные из файла"""
-        self.deadlines = self.file_manager.load_deadlines()
\ No newline at end of file
+        for deadline in deletes:
+            self.discard_deadline(deadline)
+            self.notification_manager.forget(deadline.id)
+        for deadline in puts:
+            current = self.deadlines_by_id.get(deadline.id)
+            if current is not None:
+                self.discard_deadline(current)
+            self.insert_deadline(deadline)
+        self._deadline_arrays = None
+
+        # Несохраненная запись содержит старый список: кладем в нее версии с диска
+        if self.store.has_pending():
+            self.store.apply_changes([("put", d) for d in puts] + [("delete", d) for d in deletes],
+                                     self.deadlines)
+
+        metrics.inc("external_changes_applied", len(puts))
+        metrics.inc("external_deletes_applied", len(deletes))
+        self.refresh_rows(datetime.now())
+        self.schedule_urgency_check()
+
+    def on_close(self):
+        """Сохраняет несохраненные изменения перед выходом"""
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+        try:
+            self.store.close()
+        except Exception as e:
+            # Диск заполнен или только для чтения: окно закрывается, но о потере сообщаем
+            print(e)
+            messagebox.showerror("Ошибка", f"{e}\nПоследние изменения не сохранены.")
+        self.notification_manager.close()
+        self.timers.cancel_all()
+        metrics.stop_exporter()
+        self.root.destroy()
+
+    def show_first_page(self):
+        """Показывает срочные и ближайшие дедлайны, пока весь список загружается.
+
+        Только для хранилищ, которые находят их, не читая все данные
+        (partial_load); для остальных первая страница стоила бы полной загрузки.
+        """
+        if not self.store.partial_load:
+            return
+        current_time = datetime.now()
+        first_page = []
+        if self.store.indexed:
+            # Страница небольшая: до загрузки список еще не виртуальный
+            first_page = self.store.urgent_deadlines(current_time)[:config.FIRST_PAGE_SIZE]
+        shown = {deadline.id for deadline in first_page}
+        first_page += [deadline for deadline in self.store.next_deadlines(config.FIRST_PAGE_SIZE, current_time)
+                       if deadline.id not in shown]
+        for deadline in first_page:
+            self.insert_deadline(deadline)
+        self.refresh_rows(current_time)
+
+    def start_loading(self):
+        """Загружает весь список в фоновом потоке; check_loaded подставляет его в окно"""
+        def run():
+            try:
+                deadlines = SortedDeadlines(self.store.load_deadlines())
+            except Exception as e:
+                print(f"Ошибка загрузки данных: {e}")
+                deadlines = SortedDeadlines()
+            # Индексы, которые не зависят от окна, строятся здесь же
+            by_id = {deadline.id: deadline for deadline in deadlines}
+            urgency_scheduler = UrgencyScheduler()
+            urgency_scheduler.rebuild(deadlines)
+            self._loaded.put((deadlines, by_id, urgency_scheduler))
+
+        self._loading = True
+        threading.Thread(target=run, name="load", daemon=True).start()
+        self.timers.schedule("load", config.LOAD_CHECK_MS, self.check_loaded)
+
+    def check_loaded(self):
+        """Подставляет загруженный список, когда он готов, и запускает обновления"""
+        try:
+            loaded = self._loaded.get_nowait()
+        except queue.Empty:
+            self.timers.schedule("load", config.LOAD_CHECK_MS, self.check_loaded)
+            return
+        self.load_data(*loaded)
+        self._loading = False
+        self.update_view_mode()
+        self.root.title(config.APP_TITLE)
+        self.update_display()
+        self.start_file_watch()
+
+    def load_data(self, deadlines, deadlines_by_id, urgency_scheduler):
+        """Подставляет загруженные в фоне список и индексы"""
+        self.deadlines = deadlines
+        self.deadlines_by_id = deadlines_by_id
+        self.search_index.rebuild(self.deadlines)
+        self.urgency_scheduler = urgency_scheduler
+        self._deadline_arrays = None
+        self.render_cache.clear()
+        # Записи об уведомлениях удаленных дедлайнов больше не нужны
+        self.notification_manager.save_state(datetime.now(), {d.id for d in self.deadlines})
\ No newline at end of file
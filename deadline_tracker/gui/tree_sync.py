@@ -0,0 +1,82 @@
+class TreeviewSync:
+    """Приводит строки ttk.Treeview к нужному состоянию с минимумом изменений.
+
+    Каждая строка имеет постоянный iid. При синхронизации удаляются только
+    пропавшие строки, добавляются новые, перемещаются строки, сменившие место,
+    а значения и теги обновляются только там, где они изменились.
+    Выделение и положение прокрутки при этом сохраняются.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._rows = {}  # iid -> (values, tags), как они сейчас показаны
+        self._order = []  # iid в порядке показа
+
+    def sync(self, rows):
+        """Синхронизирует Treeview со списком строк (iid, values, tags)"""
+        rows = list(rows)
+        new_iids = {iid for iid, _, _ in rows}
+        first_visible = self.tree.yview()[0]
+
+        removed = [iid for iid in self._order if iid not in new_iids]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self._rows[iid]
+
+        current = [iid for iid in self._order if iid in new_iids]
+        structure_changed = bool(removed)
+
+        for index, (iid, values, tags) in enumerate(rows):
+            shown = self._rows.get(iid)
+
+            if shown is None:
+                self.tree.insert("", index, iid=iid, values=values, tags=tags)
+                current.insert(index, iid)
+                structure_changed = True
+            else:
+                self._update_row(iid, shown, values, tags)
+
+                if current[index] != iid:
+                    self.tree.move(iid, "", index)
+                    current.remove(iid)
+                    current.insert(index, iid)
+                    structure_changed = True
+
+            self._rows[iid] = (values, tags)
+
+        self._order = current
+
+        if structure_changed:
+            self.tree.yview_moveto(first_visible)
+
+    def update_row(self, iid, values, tags):
+        """Обновляет одну уже показанную строку, не трогая остальные"""
+        shown = self._rows.get(iid)
+        if shown is None:
+            return
+        self._update_row(iid, shown, values, tags)
+        self._rows[iid] = (values, tags)
+
+    def _update_row(self, iid, shown, values, tags):
+        shown_values, shown_tags = shown
+        if shown_values != values and shown_tags != tags:
+            self.tree.item(iid, values=values, tags=tags)
+        elif shown_values != values:
+            self._update_cells(iid, shown_values, values)
+        elif shown_tags != tags:
+            self.tree.item(iid, tags=tags)
+
+    def _update_cells(self, iid, old_values, new_values):
+        """Обновляет только изменившиеся ячейки строки"""
+        columns = self.tree["columns"]
+        for column, old, new in zip(columns, old_values, new_values):
+            if old != new:
+                self.tree.set(iid, column, new)
+
+    def clear(self):
+        """Удаляет все строки"""
+        if self._order:
+            self.tree.delete(*self._order)
+        self._rows = {}
+        self._order = []
@@ -0,0 +1,132 @@
+from tkinter import ttk
+
+from gui.tree_sync import TreeviewSync
+import config
+
+HEADING_HEIGHT = 25  # примерная высота строки заголовков в пикселях
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview, в котором существуют только строки видимой области и небольшой запас вокруг неё.
+
+    Данные берутся из полного отсортированного набора через row_getter(index),
+    который возвращает (iid, значения, теги). Полоса прокрутки показывает
+    положение во всём наборе, а при прокрутке строки пересоздаются через
+    TreeviewSync, так что меняются только вышедшие из окна и вошедшие в него.
+    """
+
+    def __init__(self, parent, columns, overscan=None, height=15):
+        super().__init__(parent)
+        self.overscan = overscan if overscan is not None else config.VIRTUAL_OVERSCAN
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.sync = TreeviewSync(self.tree)
+
+        self._count = 0
+        self._row_getter = None
+        self._offset = 0  # индекс первой видимой строки во всём наборе
+        self._start = 0  # границы созданных строк [start, end)
+        self._end = 0
+        self._visible = height
+        self._selected_iid = None
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+    def set_rows(self, count, row_getter):
+        """Задает набор строк и перерисовывает видимое окно"""
+        self._count = count
+        self._row_getter = row_getter
+        self._offset = self._clamp(self._offset)
+        self._render()
+
+    def selected_iid(self):
+        """iid выбранной строки, даже если она сейчас прокручена за пределы окна"""
+        selected = self.tree.selection()
+        if selected:
+            return selected[0]
+        return self._selected_iid
+
+    def _clamp(self, offset):
+        return max(0, min(offset, self._count - self._visible))
+
+    def _render(self):
+        """Создает строки окна вокруг текущего смещения"""
+        start = max(0, self._offset - self.overscan)
+        end = min(self._count, self._offset + self._visible + self.overscan)
+        self._start, self._end = start, end
+
+        if self._row_getter is not None:
+            self.sync.sync(self._row_getter(index) for index in range(start, end))
+
+        if self._selected_iid is not None and self.tree.exists(self._selected_iid):
+            if self._selected_iid not in self.tree.selection():
+                self.tree.selection_set(self._selected_iid)
+
+        if end > start:
+            self.tree.yview_moveto((self._offset - start) / (end - start))
+        self._update_scrollbar()
+
+    def _scroll_to(self, offset):
+        offset = self._clamp(offset)
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _update_scrollbar(self):
+        if self._count == 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self._offset / self._count,
+                           min(1.0, (self._offset + self._visible) / self._count))
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * self._count))
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self._scroll_to(self._offset + int(args[1]) * step)
+
+    def _on_tree_scroll(self, first, last):
+        """Собственная прокрутка Treeview (колесо мыши, клавиши) внутри созданного окна"""
+        window = self._end - self._start
+        if window == 0:
+            self._update_scrollbar()
+            return
+
+        offset = self._clamp(self._start + round(float(first) * window))
+        if offset == self._offset:
+            self._update_scrollbar()
+            return
+        self._offset = offset
+
+        # Подгружаем строки заранее, пока прокрутка не уперлась в край окна
+        margin = self.overscan // 2
+        near_top = self._start > 0 and offset - self._start < margin
+        near_bottom = self._end < self._count and self._end - (offset + self._visible) < margin
+        if near_top or near_bottom:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        visible = max(1, (event.height - HEADING_HEIGHT) // row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self._offset = self._clamp(self._offset)
+            self._render()
+
+    def _on_select(self, event):
+        selected = self.tree.selection()
+        if selected:
+            self._selected_iid = selected[0]
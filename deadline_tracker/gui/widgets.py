@@ -67,4 +67,34 @@ class DeadlineInputFrame(ttk.Frame):
         """Очищает поля ввода"""
         self.name_entry.delete(0, tk.END)
         self.date_entry.delete(0, tk.END)
-        self.days_needed_entry.delete(0, tk.END)
\ No newline at end of file
+        self.days_needed_entry.delete(0, tk.END)
+
+
+class SearchFrame(ttk.Frame):
+    """Строка поиска по названию над списком дедлайнов"""
+
+    def __init__(self, parent, on_change_callback=None):
+        super().__init__(parent)
+        self.on_change_callback = on_change_callback
+        self.query_var = tk.StringVar()
+        self.create_widgets()
+
+    def create_widgets(self):
+        ttk.Label(self, text="Поиск:").grid(row=0, column=0, sticky="w")
+        self.search_entry = ttk.Entry(self, textvariable=self.query_var, width=40)
+        self.search_entry.grid(row=0, column=1, padx=5, sticky="ew")
+        ttk.Button(self, text="Сбросить", command=self.clear).grid(row=0, column=2)
+        self.grid_columnconfigure(1, weight=1)
+
+        # Список фильтруется при каждом изменении текста
+        self.query_var.trace_add("write", self._on_change)
+
+    def get_query(self):
+        return self.query_var.get()
+
+    def clear(self):
+        self.query_var.set("")
+
+    def _on_change(self, *args):
+        if self.on_change_callback:
+            self.on_change_callback(self.get_query())
@@ -1,18 +1,27 @@
+import uuid
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Optional
 
 
+def item_id(data) -> str:
+    """Идентификатор сохраненного дедлайна; в старых файлах его роль играло время создания"""
+    return data.get("id") or data["created"]
+
+
 @dataclass
 class Deadline:
     name: str
     deadline: datetime
     days_needed: Optional[int] = None
     created: Optional[datetime] = None
+    id: Optional[str] = None  # постоянный идентификатор: iid строки в treeview и ключ в хранилищах
 
     def __post_init__(self):
         if self.created is None:
             self.created = datetime.now()
+        if self.id is None:
+            self.id = uuid.uuid4().hex
 
     def to_dict(self):
         """Конвертирует в словарь для сохранения"""
@@ -20,7 +29,8 @@ class Deadline:
             "name": self.name,
             "deadline": self.deadline.isoformat(),
             "days_needed": self.days_needed,
-            "created": self.created.isoformat()
+            "created": self.created.isoformat(),
+            "id": self.id
         }
 
     @classmethod
@@ -30,7 +40,8 @@ class Deadline:
             name=data["name"],
             deadline=datetime.fromisoformat(data["deadline"]),
             days_needed=data["days_needed"],
-            created=datetime.fromisoformat(data["created"])
+            created=datetime.fromisoformat(data["created"]),
+            id=item_id(data)
         )
 
     def is_urgent(self, current_time=None) -> bool:
@@ -0,0 +1,93 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple
+from models.deadline import Deadline
+
+
+def _sort_key(deadline: Deadline) -> Tuple[datetime, str]:
+    # id различает дедлайны с одинаковой датой, поэтому позиция любого дедлайна однозначна
+    return deadline.deadline, deadline.id
+
+
+class SortedDeadlines:
+    """Дедлайны, всегда упорядоченные по дате.
+
+    Рядом со списком дедлайнов хранится список ключей сортировки (дата, id),
+    по которому позиция при вставке, поиске и удалении находится бинарным
+    поиском, а выборка по диапазону дат - двумя бинарными поисками и срезом.
+    Дедлайн внутри контейнера менять нельзя: при редактировании он удаляется
+    (remove), а вместо него добавляется измененная копия (add). Список дедлайнов
+    меняется только операциями над ним целиком (вставка, удаление, замена),
+    поэтому срез [:] из другого потока всегда видит целый список.
+    version увеличивается при каждом изменении состава списка.
+    """
+
+    def __init__(self, deadlines: Iterable[Deadline] = ()):
+        self._items: List[Deadline] = sorted(deadlines, key=_sort_key)
+        self._keys = [_sort_key(deadline) for deadline in self._items]
+        self.version = 0
+
+    def add(self, deadline: Deadline):
+        key = _sort_key(deadline)
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._items.insert(index, deadline)
+        self.version += 1
+
+    def extend(self, deadlines: Iterable[Deadline]):
+        """Добавляет несколько дедлайнов; крупные пачки - одной сортировкой"""
+        deadlines = list(deadlines)
+        if len(deadlines) * 8 < len(self._items):
+            for deadline in deadlines:
+                self.add(deadline)
+            return
+        # Сортировка на месте временно опустошает список: сортируем новый и подменяем
+        items = self._items + deadlines
+        items.sort(key=_sort_key)
+        self._keys = [_sort_key(deadline) for deadline in items]
+        self._items = items
+        self.version += 1
+
+    def index(self, deadline: Deadline) -> int:
+        """Позиция дедлайна; ValueError, если его нет"""
+        key = _sort_key(deadline)
+        index = bisect_left(self._keys, key)
+        if index == len(self._keys) or self._keys[index] != key:
+            raise ValueError(f"дедлайна {deadline.id} нет в списке")
+        return index
+
+    def remove(self, deadline: Deadline):
+        index = self.index(deadline)
+        del self._keys[index]
+        del self._items[index]
+        self.version += 1
+
+    def range_indices(self, start: datetime = None, end: datetime = None) -> Tuple[int, int]:
+        """Границы позиций [lo, hi) дедлайнов с датой start <= дата < end"""
+        lo = 0 if start is None else bisect_left(self._keys, (start,))
+        hi = len(self._keys) if end is None else bisect_left(self._keys, (end,))
+        return lo, max(lo, hi)
+
+    def between(self, start: datetime = None, end: datetime = None) -> List[Deadline]:
+        """Дедлайны с датой start <= дата < end по возрастанию даты"""
+        lo, hi = self.range_indices(start, end)
+        return self._items[lo:hi]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Deadline]:
+        return iter(self._items)
+
+    def __contains__(self, deadline):
+        try:
+            self.index(deadline)
+            return True
+        except ValueError:
+            return False
+
+    def __repr__(self):
+        return f"SortedDeadlines({self._items!r})"
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.atomic_file import assert_can_wait, atomic_write, file_lock
+
+
+class AtomicWriteLockOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "data.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_under_file_lock_does_not_wait_for_group_leader(self):
+        # Лидер групповой записи ждет блокировку, которую держит этот поток
+        with file_lock(self.filename):
+            leader = threading.Thread(target=atomic_write, args=(self.filename, "старое"), daemon=True)
+            leader.start()
+            time.sleep(0.1)
+            # Запись из потока, который держит блокировку
+            atomic_write(self.filename, "новое")
+        leader.join(timeout=5)
+        self.assertFalse(leader.is_alive())
+
+        # Более старая версия лидера не перезаписывает более новую
+        with open(self.filename, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "новое")
+
+    def test_waiting_under_file_lock_is_rejected(self):
+        assert_can_wait("Ожидание")
+        with file_lock(self.filename):
+            with self.assertRaises(RuntimeError):
+                assert_can_wait("Ожидание")
+        assert_can_wait("Ожидание")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from utils.cooldown_store import CooldownStore
+
+
+class SharedCooldownFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "cooldowns.json")
+        self.now = datetime(2030, 1, 1, 12, 0)
+        # Окно и демон работают с одним файлом
+        self.gui = CooldownStore(self.filename, cooldown=3600)
+        self.daemon = CooldownStore(self.filename, cooldown=3600)
+        self.gui.load()
+        self.daemon.load()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _reload(self):
+        store = CooldownStore(self.filename, cooldown=3600)
+        store.load()
+        return store
+
+    def test_saves_from_two_processes_are_merged(self):
+        self.gui.set("a", self.now)
+        self.gui.save()
+        self.daemon.set("b", self.now)
+        self.daemon.save()
+
+        store = self._reload()
+        self.assertEqual(store.get("a"), self.now)
+        self.assertEqual(store.get("b"), self.now)
+
+    def test_later_notification_time_wins(self):
+        later = self.now + timedelta(minutes=5)
+        self.daemon.set("a", later)
+        self.daemon.save()
+        self.gui.set("a", self.now)
+        self.gui.save()
+        self.assertEqual(self._reload().get("a"), later)
+
+    def test_transaction_sees_notification_of_other_process(self):
+        self.daemon.set("a", self.now)
+        self.daemon.save()
+        with self.gui.transaction():
+            self.assertEqual(self.gui.get("a"), self.now)
+
+    def test_removed_deadline_is_not_restored_by_merge(self):
+        self.gui.set("a", self.now)
+        self.gui.save()
+        self.daemon.load()
+        self.daemon.evict(self.now, active_keys=set())
+        self.daemon.save()
+        self.gui.set("b", self.now)
+        self.gui.save()
+
+        store = self._reload()
+        self.assertNotIn("a", store)
+        self.assertIn("b", store)
+
+    def test_expired_entry_does_not_drop_newer_notification(self):
+        self.gui.set("a", self.now)
+        self.gui.save()
+        self.daemon.load()
+        later = self.now + timedelta(hours=2)
+        self.gui.set("a", later)
+        self.gui.save()
+        # У демона запись устарела, но окно уже уведомило снова
+        self.daemon.evict(later)
+        self.daemon.save()
+        self.assertEqual(self._reload().get("a"), later)
+
+
+if __name__ == "__main__":
+    unittest.main()
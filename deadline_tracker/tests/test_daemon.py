@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from daemon import NotifierDaemon
+from models.deadline import Deadline
+from utils.cooldown_store import CooldownStore
+from utils.sqlite_store import SqliteDeadlineStore
+from utils.store import DeadlineStore
+
+
+class _RecordingNotifications:
+    def __init__(self, filename):
+        self.cooldowns = CooldownStore(filename)
+        self.calls = []
+
+    def notify_urgent(self, deadlines, current_time, newly_urgent=()):
+        self.calls.append(([d.name for d in deadlines], set(newly_urgent)))
+
+    def save_state(self, current_time, active_keys=None):
+        pass
+
+
+class IndexedDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SqliteDeadlineStore(os.path.join(self.directory.name, "deadlines.db"))
+        self.now = datetime(2030, 1, 1, 12, 0)
+        self.store.save_deadlines([
+            Deadline("Срочный", self.now + timedelta(days=1), 3),
+            Deadline("Позже", self.now + timedelta(days=10, hours=5), 10),
+            Deadline("Без срока", self.now + timedelta(days=2)),
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_daemon_uses_index_queries_instead_of_full_load(self):
+        def full_load():
+            raise AssertionError("демон загрузил весь список")
+
+        expected_transition = DeadlineStore.next_urgent_time(self.store, self.now)
+        self.store.load_deadlines = full_load
+        notifications = _RecordingNotifications(os.path.join(self.directory.name, "cooldowns.json"))
+        daemon = NotifierDaemon(self.store, notifications)
+
+        daemon.tick(self.now)
+        self.assertEqual(notifications.calls[-1], (["Срочный"], set()))
+        transition = daemon.next_transition_time(self.now)
+        self.assertEqual(transition, expected_transition)
+        self.assertEqual(transition, self.now + timedelta(hours=5, microseconds=1))
+
+        daemon.tick(transition)
+        names, newly_urgent = notifications.calls[-1]
+        self.assertEqual(names, ["Срочный", "Позже"])
+        self.assertEqual(len(newly_urgent), 1)
+        self.assertIsNone(daemon.next_transition_time(transition))
+
+
+if __name__ == "__main__":
+    unittest.main()
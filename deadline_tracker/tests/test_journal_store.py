@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from utils.journal_store import JournalFileManager
+
+
+class StaleCompactionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "deadlines.json")
+        start = datetime(2030, 1, 1)
+        self.a, self.b, self.c = (Deadline(name, start + timedelta(days=i), 1)
+                                  for i, name in enumerate("ABC"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_journal(self, path, deadline):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "put", "data": deadline.to_dict()}) + "\n")
+
+    def test_stale_compacting_journal_is_folded_at_load(self):
+        store = JournalFileManager(self.filename, compact_threshold=2)
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump([self.a.to_dict()], f)
+        # Сжатие прервалось: старый журнал уже переименован, новый успел начаться
+        self._write_journal(store.compacting_filename, self.b)
+        self._write_journal(store.journal_filename, self.c)
+
+        loaded = store.load_deadlines()
+        self.assertEqual(sorted(d.name for d in loaded), ["A", "B", "C"])
+        self.assertFalse(os.path.exists(store.compacting_filename))
+        with open(self.filename, encoding="utf-8") as f:
+            self.assertEqual(sorted(item["name"] for item in json.load(f)), ["A", "B"])
+
+        # Журнал снова сжимается по достижении порога
+        store.add_deadline(Deadline("D", datetime(2030, 2, 1)))
+        store.wait_for_compaction()
+        store.close()
+        self.assertFalse(os.path.exists(store.journal_filename))
+        reloaded = JournalFileManager(self.filename).load_deadlines()
+        self.assertEqual(sorted(d.name for d in reloaded), ["A", "B", "C", "D"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from utils.file_manager import FileManager
+from utils.journal_store import JournalFileManager
+from utils.jsonl_store import JsonLinesFileManager
+from utils.live_reload import DiskState
+
+
+class IncrementalReadTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        start = datetime(2030, 1, 1)
+        self.deadlines = [Deadline(f"Задача {i}", start + timedelta(days=i), 1) for i in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def _check_reader(self, store, writer):
+        """Неизменившиеся записи возвращаются теми же объектами, изменения видны"""
+        read = store.record_reader()
+        writer.save_deadlines(self.deadlines)
+        first = read()
+        self.assertEqual(first, {d.id: d.to_dict() for d in self.deadlines})
+
+        edited = replace(self.deadlines[1], name="Изменена")
+        writer.apply_changes([("put", edited), ("delete", self.deadlines[3])],
+                             self.deadlines[:1] + [edited] + self.deadlines[2:3] + self.deadlines[4:])
+        second = read()
+        self.assertEqual(second[edited.id]["name"], "Изменена")
+        self.assertNotIn(self.deadlines[3].id, second)
+        self.assertIs(second[self.deadlines[0].id], first[self.deadlines[0].id])
+
+    def test_json_reader(self):
+        store = FileManager(self._path("deadlines.json"))
+        self._check_reader(store, store)
+
+    def test_jsonl_reader(self):
+        store = JsonLinesFileManager(self._path("deadlines.jsonl"), None)
+        self._check_reader(store, store)
+
+    def test_journal_reader_reads_appended_lines(self):
+        store = JournalFileManager(self._path("deadlines.json"), compact_threshold=100)
+        self._check_reader(store, store)
+        store.close()
+
+    def test_journal_reader_after_compaction(self):
+        store = JournalFileManager(self._path("deadlines.json"), compact_threshold=2)
+        read = store.record_reader()
+        store.save_deadlines(self.deadlines[:1])
+        read()
+        for deadline in self.deadlines[1:]:
+            store.add_deadline(deadline)
+        store.wait_for_compaction()
+        self.assertEqual(set(read()), {d.id for d in self.deadlines})
+        store.close()
+
+
+class OwnWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = FileManager(os.path.join(self.directory.name, "deadlines.json"))
+        start = datetime(2030, 1, 1)
+        self.a, self.b = Deadline("A", start, 1), Deadline("B", start + timedelta(days=1), 1)
+        self.store.save_deadlines([self.a, self.b])
+        self.disk_state = DiskState(self.store.record_reader())
+        self.disk_state.refresh()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_own_write_is_not_reported_later(self):
+        own = replace(self.a, name="A2")
+        self.store.save_deadlines([own, self.b])
+        changes = self.disk_state.refresh(own_keys={own.id})
+        self.assertEqual((changes.changed, changes.deleted), ([], []))
+
+        # Следующее внешнее изменение содержит только чужой дедлайн
+        external = replace(self.b, name="B2")
+        self.store.save_deadlines([own, external])
+        changes = self.disk_state.refresh()
+        self.assertEqual([d.id for d in changes.changed], [external.id])
+
+    def test_external_change_during_own_write_is_reported(self):
+        own, external = replace(self.a, name="A2"), replace(self.b, name="B2")
+        self.store.save_deadlines([own, external])
+        changes = self.disk_state.refresh(own_keys={own.id})
+        self.assertEqual([d.name for d in changes.changed], ["B2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
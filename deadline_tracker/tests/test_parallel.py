@@ -0,0 +1,20 @@
+import unittest
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from utils.parallel import urgency_report
+
+
+class ParallelUrgencyTest(unittest.TestCase):
+    def test_pool_result_matches_serial(self):
+        now = datetime(2030, 1, 1)
+        deadlines = [Deadline(f"Дедлайн {i}", now + timedelta(hours=i * 5 - 200), i % 7 or None)
+                     for i in range(500)]
+        serial = urgency_report(deadlines, now, workers=1)
+        pooled = urgency_report(deadlines, now, threshold=0, workers=2, chunk_size=100)
+        self.assertEqual(pooled, serial)
+        self.assertTrue(serial.urgent and serial.overdue)
+
+
+if __name__ == "__main__":
+    unittest.main()
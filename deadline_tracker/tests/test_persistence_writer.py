@@ -0,0 +1,46 @@
+import unittest
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from models.sorted_deadlines import SortedDeadlines
+from utils.persistence_writer import DebouncedStoreWriter
+from utils.store import DeadlineStore
+
+
+class _RecordingStore(DeadlineStore):
+    def __init__(self):
+        self.written = []
+
+    def load_deadlines(self):
+        return []
+
+    def save_deadlines(self, deadlines):
+        self.written.append(deadlines)
+
+    def close(self):
+        pass
+
+
+class SnapshotHandOffTest(unittest.TestCase):
+    def test_writer_copies_the_list_it_was_given(self):
+        start = datetime(2030, 1, 1)
+        deadlines = SortedDeadlines(Deadline(f"Дедлайн {i}", start + timedelta(days=i), 1)
+                                    for i in range(3))
+        store = _RecordingStore()
+        writer = DebouncedStoreWriter(store, debounce=60, max_delay=60)
+        writer.add_deadline(deadlines[0], deadlines)
+        # Изменение, сделанное до записи, попадает в нее
+        deadlines.add(Deadline("Новый", start + timedelta(days=10), 1))
+        writer.flush()
+        writer.close()
+
+        written = store.written[-1]
+        self.assertIsInstance(written, list)
+        self.assertEqual([d.name for d in written], [d.name for d in deadlines])
+        # Запись держит свою копию, а не список окна
+        deadlines.remove(deadlines[0])
+        self.assertEqual(len(written), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
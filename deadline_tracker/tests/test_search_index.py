@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from models.sorted_deadlines import SortedDeadlines
+from utils.search_index import MatchPositions, NameSearchIndex, SearchFilter, tokenize
+
+
+def _matching(deadlines, query):
+    """Позиции найденных полным просмотром: слова запроса - начала слов названия"""
+    words = query.casefold().split()
+    complete = words if query.endswith(" ") else words[:-1]
+    prefix = None if query.endswith(" ") else words[-1]
+    result = []
+    for position, deadline in enumerate(deadlines):
+        tokens = tokenize(deadline.name)
+        if all(word in tokens for word in complete) and (
+                prefix is None or any(token.startswith(prefix) for token in tokens)):
+            result.append(position)
+    return result
+
+
+class SearchTest(unittest.TestCase):
+    QUERIES = ["о", "отч", "отчет ", "отчет 1", "отчет 12", "1", "12 ", "ревью 3"]
+
+    def setUp(self):
+        start = datetime(2030, 1, 1)
+        names = ["Отчет", "Ревью", "Релиз"]
+        self.deadlines = SortedDeadlines(
+            Deadline(f"{names[i % 3]} {i}", start + timedelta(hours=(i * 7919) % 5000), 1)
+            for i in range(3000))
+        self.index = NameSearchIndex(self.deadlines)
+        self.search_filter = SearchFilter(self.index)
+
+    def _check(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                positions = self.search_filter.positions(query, self.deadlines)
+                expected = _matching(self.deadlines, query)
+                self.assertEqual(len(positions), len(expected))
+                self.assertEqual(positions[:20], expected[:20])
+                self.assertEqual(list(positions), expected)
+
+    def test_positions_match_full_scan(self):
+        self._check()
+
+    def test_changes_after_prefix_unions_are_cached(self):
+        self._check()
+        # Объединение узла "1" уже запомнено: изменения должны его обновить
+        removed = self.deadlines[10]
+        self.deadlines.remove(removed)
+        self.index.remove(removed)
+        added = Deadline("Отчет 1999999", datetime(2030, 3, 1), 1)
+        self.deadlines.add(added)
+        self.index.add(added)
+        self._check()
+
+    def test_many_matches_are_paged_lazily(self):
+        positions = self.search_filter.positions("отчет", self.deadlines)
+        self.assertIsInstance(positions, MatchPositions)
+        self.assertEqual(positions[-1], _matching(self.deadlines, "отчет")[-1])
+        with self.assertRaises(IndexError):
+            positions[len(positions)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from models.deadline import Deadline
+from utils.journal_store import JournalFileManager
+from utils.snapshot_cache import CachedStore
+
+
+class _SlowJournal(JournalFileManager):
+    """Журнал, снимок которого пишется с задержкой, чтобы сжатие успело начаться"""
+
+    def _write_snapshot(self, items):
+        time.sleep(0.3)
+        super()._write_snapshot(items)
+
+
+class CachedJournalStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "deadlines.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_full_save_during_compaction_does_not_deadlock(self):
+        store = CachedStore(_SlowJournal(self.filename, compact_threshold=2))
+        start = datetime(2030, 1, 1)
+        deadlines = [Deadline(f"Дедлайн {i}", start + timedelta(days=i), 1) for i in range(3)]
+
+        # Два изменения в журнале запускают фоновое сжатие с медленной записью снимка
+        store.apply_changes([("put", d) for d in deadlines[:2]], deadlines[:2])
+        self.assertIsNotNone(store.store._compaction)
+
+        saver = threading.Thread(target=store.save_deadlines, args=(deadlines,), daemon=True)
+        saver.start()
+        saver.join(timeout=10)
+        self.assertFalse(saver.is_alive(), "полное сохранение зависло, пока шло сжатие журнала")
+
+        store.close()
+        reloaded = JournalFileManager(self.filename).load_deadlines()
+        self.assertEqual(sorted(d.id for d in reloaded), sorted(d.id for d in deadlines))
+
+
+if __name__ == "__main__":
+    unittest.main()
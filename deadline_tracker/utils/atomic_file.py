@@ -0,0 +1,288 @@
+"""Атомарная запись файлов под межпроцессной блокировкой.
+
+Файл записывается во временный файл в том же каталоге, сбрасывается
+на диск (fsync) и подменяет старый через os.replace, поэтому читатель
+видит либо старое, либо новое содержимое целиком, а аварийное завершение
+посреди записи не оставляет обрезанный файл. Запись идет под
+рекомендательной блокировкой <файл>.lock (fcntl.flock, в Windows -
+msvcrt.locking), так что трекер, демон и старый daily_notification.py
+не пишут один файл одновременно. Это относится к файлам, которые пишутся
+через atomic_write; журнал JournalFileManager дописывается под той же
+блокировкой, но сам по себе рассчитан на одного пишущего.
+
+Файл <файл>.lock остается рядом с файлом данных и после выхода: он пустой,
+а удалять его небезопасно - процесс, уже открывший старый файл блокировки,
+и процесс, создавший новый, считали бы, что оба держат блокировку.
+
+Порядок блокировок: держа FileLock, нельзя ждать другой поток (join,
+Condition.wait, очередь), потому что тот может ждать эту же блокировку.
+Внутри FileLock можно брать только другие FileLock производных файлов
+(кэш, журнал) и короткие блокировки, под которыми никто не ждет.
+AtomicFileWriter соблюдает это сам: если вызывающий поток уже держит
+какую-нибудь FileLock, он записывает файл сам, а не ждет групповую запись.
+assert_can_wait() проверяет правило там, где поток ждет другой поток.
+
+Модуль не зависит от остального пакета: daily_notification.py
+импортирует его как deadline_tracker.utils.atomic_file.
+"""
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+_held = threading.local()  # число FileLock, которые держит текущий поток
+
+
+def holding_file_lock() -> bool:
+    """Держит ли текущий поток хотя бы одну FileLock"""
+    return getattr(_held, "count", 0) > 0
+
+
+def assert_can_wait(what):
+    """RuntimeError, если поток собирается ждать другой поток, держа FileLock"""
+    if holding_file_lock():
+        raise RuntimeError(f"{what} под блокировкой файла: возможна взаимная блокировка")
+
+
+def _lock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        # LK_LOCK сдается после 10 попыток, поэтому ждем в цикле
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Рекомендательная блокировка файла для потоков и процессов.
+
+    Внутри процесса потоки ждут на RLock, между процессами - на flock
+    файла <path>.lock. Повторный захват тем же потоком разрешен.
+    Без fcntl и msvcrt остается только блокировка между потоками.
+    """
+
+    def __init__(self, path):
+        self.lock_filename = path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+        self._owner = None  # поток, который держит блокировку
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.lock_filename, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    _lock_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+            self._owner = threading.get_ident()
+        self._depth += 1
+        _held.count = getattr(_held, "count", 0) + 1
+
+    def is_held(self) -> bool:
+        """Держит ли блокировку текущий поток"""
+        return self._owner == threading.get_ident()
+
+    def release(self):
+        _held.count -= 1
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def _fsync_directory(directory):
+    """Сбрасывает на диск запись каталога, чтобы переименование пережило сбой питания"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def replace_file(path, data: bytes):
+    """Записывает data во временный файл, сбрасывает его на диск и подменяет им path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    # Уникальное имя: временные файлы двух процессов не перезапишут друг друга
+    fd, tmp_filename = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                        suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_filename, mode)
+        os.replace(tmp_filename, path)
+    except BaseException:
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+class AtomicFileWriter:
+    """Атомарная запись одного файла с групповой фиксацией.
+
+    Каждая запись заменяет файл целиком, поэтому из нескольких записей,
+    пришедших из разных потоков, пока идет fsync предыдущей, на диск
+    достаточно отправить только последнюю: первый поток в очереди
+    записывает самое новое содержимое под блокировкой, а остальные
+    ждут и возвращаются, когда их версия (или более новая) записана.
+    Поток, который уже держит FileLock, не ждет очередь, а записывает
+    свою версию сразу; более старая версия после нее уже не пишется.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = file_lock(path)
+        self._condition = threading.Condition()
+        self._data = None
+        self._submitted = 0  # номер последней переданной версии
+        self._committed = 0  # номер последней записанной версии
+        self._failed = 0  # номер последней версии, которую записать не удалось
+        self._error = None
+        self._writing = False
+        self.commits = 0  # число записей на диск (для замеров)
+
+    def write(self, data: bytes):
+        if holding_file_lock():
+            self._write_now(data)
+            return
+
+        with self._condition:
+            self._submitted += 1
+            version = self._submitted
+            self._data = data
+
+            while self._committed < version:
+                if self._failed >= version:
+                    raise self._error
+                if self._writing:
+                    self._condition.wait()
+                    continue
+
+                self._writing = True
+                data, batch_version, self._data = self._data, self._submitted, None
+                self._condition.release()
+                error = None
+                try:
+                    with self.lock:
+                        # Пока ждали блокировку, поток под FileLock мог записать версию новее
+                        if self._committed < batch_version:
+                            replace_file(self.path, data)
+                except Exception as e:
+                    error = e
+                finally:
+                    self._condition.acquire()
+                    self._writing = False
+                    self._condition.notify_all()
+
+                if error is not None:
+                    self._failed = max(self._failed, batch_version)
+                    self._error = error
+                    raise error
+                if self._committed < batch_version:
+                    self._committed = batch_version
+                    self.commits += 1
+
+    def _write_now(self, data: bytes):
+        """Запись без ожидания очереди (вызывающий держит FileLock)"""
+        with self.lock:
+            with self._condition:
+                self._submitted += 1
+                version = self._submitted
+                # Ожидающая версия старше этой и больше не нужна
+                self._data = None
+            try:
+                replace_file(self.path, data)
+            except Exception as e:
+                with self._condition:
+                    self._failed = max(self._failed, version)
+                    self._error = e
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._committed = max(self._committed, version)
+                self.commits += 1
+                self._condition.notify_all()
+
+
+_registry_lock = threading.RLock()  # AtomicFileWriter берет file_lock при создании
+_locks = {}
+_writers = {}
+
+
+def file_lock(path) -> FileLock:
+    """Общая для процесса блокировка файла path (flock не различает потоки одного процесса)"""
+    key = os.path.abspath(path)
+    with _registry_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = FileLock(key)
+        return lock
+
+
+def atomic_write(path, data, encoding="utf-8"):
+    """Атомарно заменяет содержимое файла path строкой или байтами data"""
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    key = os.path.abspath(path)
+    with _registry_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = AtomicFileWriter(key)
+    writer.write(data)
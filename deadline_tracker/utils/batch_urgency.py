@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from models.collection import DeadlineCollection, NO_DAYS_NEEDED, to_epoch_us
+
+MINUTE_US = 60 * 1_000_000
+HOUR_US = 60 * MINUTE_US
+DAY_US = 24 * HOUR_US
+
+
+@dataclass
+class BatchStatus:
+    """Результат пакетного расчета: по элементу массива на дедлайн"""
+    urgent: np.ndarray  # bool, как Deadline.is_urgent
+    overdue: np.ndarray  # bool, как Deadline.is_overdue
+    days: np.ndarray  # оставшееся время, как в MainWindow.calculate_time_remaining
+    hours: np.ndarray
+    minutes: np.ndarray
+
+    def remaining_text(self, index) -> str:
+        """Строка "Осталось времени" для дедлайна с номером index"""
+        if self.overdue[index]:
+            return "ПРОСРОЧЕНО!"
+        return f"{self.days[index]} дн. {self.hours[index]} ч. {self.minutes[index]} мин."
+
+    def urgent_indices(self):
+        """Номера срочных дедлайнов"""
+        return np.flatnonzero(self.urgent)
+
+    def highlighted(self, index) -> bool:
+        """Нужно ли подсвечивать строку (срочно или просрочено)"""
+        return bool(self.urgent[index] or self.overdue[index])
+
+
+class DeadlineArrays:
+    """Дата дедлайна и дни на выполнение в массивах NumPy.
+
+    Массивы строятся один раз на набор дедлайнов (для DeadlineCollection -
+    без копирования), после чего срочность, просрочка и оставшееся время
+    для всех дедлайнов считаются одной векторной операцией на любой момент.
+    """
+
+    def __init__(self, deadlines):
+        if isinstance(deadlines, DeadlineCollection):
+            self.deadline_us = np.frombuffer(deadlines.deadline_us, dtype=np.int64)
+            self.days_needed = np.frombuffer(deadlines.days_needed, dtype=np.int32)
+        else:
+            count = len(deadlines)
+            self.deadline_us = np.fromiter(
+                (to_epoch_us(d.deadline) for d in deadlines), dtype=np.int64, count=count)
+            self.days_needed = np.fromiter(
+                (NO_DAYS_NEEDED if d.days_needed is None else d.days_needed for d in deadlines),
+                dtype=np.int32, count=count)
+
+    def __len__(self):
+        return len(self.deadline_us)
+
+    def evaluate(self, current_time=None) -> BatchStatus:
+        """Считает состояние всех дедлайнов на момент current_time"""
+        if current_time is None:
+            current_time = datetime.now()
+
+        difference = self.deadline_us - to_epoch_us(current_time)
+
+        # Целочисленное деление с округлением вниз, как timedelta.days
+        days = difference // DAY_US
+        rest = difference - days * DAY_US
+        hours = rest // HOUR_US
+        minutes = (rest % HOUR_US) // MINUTE_US
+
+        has_days_needed = self.days_needed != NO_DAYS_NEEDED
+        return BatchStatus(
+            urgent=has_days_needed & (days < self.days_needed),
+            overdue=difference <= 0,
+            days=days,
+            hours=hours,
+            minutes=minutes
+        )
+
+
+def evaluate_batch(deadlines, current_time=None) -> BatchStatus:
+    """Пакетный расчет для списка Deadline или DeadlineCollection"""
+    return DeadlineArrays(deadlines).evaluate(current_time)
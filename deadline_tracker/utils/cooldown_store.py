@@ -0,0 +1,151 @@
+import contextlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from utils.atomic_file import atomic_write, file_lock
+import config
+
+
+class CooldownStore:
+    """Время последнего уведомления по ключу дедлайна, сохраняемое между запусками.
+
+    Запись старше NOTIFICATION_COOLDOWN ничем не отличается от отсутствующей,
+    поэтому такие записи, как и записи удаленных дедлайнов, вытесняются
+    в evict(). Файл маленький: в нем только дедлайны, о которых уведомляли
+    в пределах последнего интервала, и он перезаписывается только при изменениях.
+
+    Файл общий для окна и демона. Сохранение идет под file_lock и сливает
+    записи с теми, что на диске (побеждает более позднее время), а
+    transaction() проверяет и обновляет времена под той же блокировкой,
+    поэтому два процесса не уведомляют об одном дедлайне дважды.
+    """
+
+    def __init__(self, filename=None, cooldown=None):
+        self.filename = filename or config.COOLDOWN_FILE
+        self.cooldown = timedelta(seconds=cooldown if cooldown is not None
+                                  else config.NOTIFICATION_COOLDOWN)
+        self._times = {}  # ключ дедлайна -> время последнего уведомления
+        self._changed = set()  # ключи, отмеченные с последнего чтения или записи файла
+        self._removed = {}  # ключ -> удаленное время (None - дедлайн удален) с последней записи
+        self._disk_signature = None  # (mtime, размер) файла, когда его читали или писали
+        self._dirty = False
+
+    def load(self):
+        """Загружает сохраненные времена уведомлений"""
+        try:
+            self._times = self._read_file()
+            self._changed = set()
+        except Exception as e:
+            print(f"Ошибка загрузки времени уведомлений: {e}")
+            self._times = {}
+
+    def save(self):
+        """Сохраняет времена уведомлений, если они менялись"""
+        if not self._dirty:
+            return
+        try:
+            with file_lock(self.filename):
+                self._merge_from_disk()
+                self._write()
+        except Exception as e:
+            print(f"Ошибка сохранения времени уведомлений: {e}")
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Чтение и изменение времен под блокировкой файла; изменения сохраняются в конце"""
+        with file_lock(self.filename):
+            self._merge_from_disk()
+            yield self
+            if self._dirty:
+                try:
+                    self._write()
+                except Exception as e:
+                    print(f"Ошибка сохранения времени уведомлений: {e}")
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.filename)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _read_file(self) -> dict:
+        signature = self._signature()
+        times = {}
+        if signature is not None:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            times = {key: datetime.fromisoformat(value) for key, value in data.items()}
+        self._disk_signature = signature
+        return times
+
+    def _merge_from_disk(self):
+        """Добавляет записи, сохраненные другим процессом (вызывается под блокировкой)"""
+        if self._signature() == self._disk_signature:
+            return
+        try:
+            disk = self._read_file()
+        except Exception as e:
+            print(f"Ошибка загрузки времени уведомлений: {e}")
+            return
+
+        times = dict(disk)
+        for key, removed in self._removed.items():
+            # Более позднее уведомление другого процесса не удаляется вместе с истекшим
+            if key in times and (removed is None or times[key] <= removed):
+                del times[key]
+        for key, value in self._times.items():
+            if key in times:
+                times[key] = max(times[key], value)
+            elif key in self._changed:
+                times[key] = value
+            # Иначе запись удалил другой процесс
+        self._times = times
+        # Записывать нужно, только если на диске не хватает наших изменений
+        self._dirty = times != disk
+        if not self._dirty:
+            self._changed = set()
+            self._removed = {}
+
+    def _write(self):
+        data = {key: value.isoformat() for key, value in self._times.items()}
+        atomic_write(self.filename, json.dumps(data, ensure_ascii=False))
+        self._disk_signature = self._signature()
+        self._changed = set()
+        self._removed = {}
+        self._dirty = False
+
+    def get(self, key) -> Optional[datetime]:
+        return self._times.get(key)
+
+    def set(self, key, current_time: datetime):
+        self._times[key] = current_time
+        self._changed.add(key)
+        self._removed.pop(key, None)
+        self._dirty = True
+
+    def discard(self, key):
+        if self._times.pop(key, None) is not None:
+            self._changed.discard(key)
+            self._removed[key] = None
+            self._dirty = True
+
+    def evict(self, current_time: datetime, active_keys=None) -> int:
+        """Удаляет истекшие записи и записи дедлайнов не из active_keys; возвращает их число"""
+        expired = [key for key, last in self._times.items()
+                   if current_time - last >= self.cooldown
+                   or (active_keys is not None and key not in active_keys)]
+        for key in expired:
+            last = self._times.pop(key)
+            self._changed.discard(key)
+            self._removed[key] = None if active_keys is not None and key not in active_keys else last
+        if expired:
+            self._dirty = True
+        return len(expired)
+
+    def __len__(self):
+        return len(self._times)
+
+    def __contains__(self, key):
+        return key in self._times
@@ -1,23 +1,27 @@
 import json
 import os
-from typing import List
+from typing import Callable, Dict, List
 from models.deadline import Deadline
+from utils.atomic_file import atomic_write
+from utils.metrics import metrics
+from utils.store import DeadlineStore, RecordParser
 
 
-class FileManager:
+class FileManager(DeadlineStore):
     def __init__(self, filename="deadlines.json"):
         self.filename = filename
 
+    @metrics.timed("file_save")
     def save_deadlines(self, deadlines: List[Deadline]):
-        """Сохраняет дедлайны в JSON файл"""
+        """Сохраняет дедлайны в JSON файл (атомарно, под блокировкой файла)"""
         data = [deadline.to_dict() for deadline in deadlines]
 
         try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            atomic_write(self.filename, json.dumps(data, ensure_ascii=False, indent=2))
         except Exception as e:
             raise Exception(f"Ошибка сохранения данных: {e}")
 
+    @metrics.timed("file_load")
     def load_deadlines(self) -> List[Deadline]:
         """Загружает дедлайны из JSON файла"""
         if not os.path.exists(self.filename):
@@ -30,4 +34,23 @@ class FileManager:
             return [Deadline.from_dict(item) for item in data]
         except Exception as e:
             print(f"Ошибка загрузки данных: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def load_records(self) -> List[dict]:
+        """Записи JSON файла как есть, без создания объектов Deadline"""
+        if not os.path.exists(self.filename):
+            return []
+        with open(self.filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def record_reader(self) -> Callable[[], Dict[str, dict]]:
+        """Чтение записей, при котором заново разбираются только изменившиеся"""
+        parser = RecordParser()
+
+        def read():
+            if not os.path.exists(self.filename):
+                return {}
+            with open(self.filename, "r", encoding="utf-8") as f:
+                return parser.parse_array(f.read())
+
+        return read
@@ -0,0 +1,164 @@
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import config
+
+# Константы inotify из <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def files_signature(paths):
+    """Путь, inode, mtime и размер каждого файла (None для отсутствующих)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None, None))
+    return tuple(signature)
+
+
+class _Inotify:
+    """Минимальная обертка над inotify через ctypes (только Linux)"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        try:
+            for directory in directories:
+                # Следим за каталогом: атомарная запись подменяет файл новым
+                if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch {directory}")
+        except Exception:
+            os.close(self.fd)
+            raise
+
+    def wait(self, timeout) -> set:
+        """Имена измененных файлов (пустое множество, если за timeout ничего не случилось)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        names = set()
+        if not ready:
+            return names
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+                offset += length
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Следит за файлами данных и вызывает on_change, когда их изменил кто-то другой.
+
+    В Linux события приходят от inotify (наблюдение за каталогами файлов),
+    в остальных системах или если inotify недоступен файлы опрашиваются
+    раз в interval секунд. Всплеск событий сворачивается: on_change
+    вызывается после settle секунд тишины и только если изменилась подпись
+    файлов (inode, mtime, размер). Собственные записи приложения выполняются
+    внутри own_write() и не считаются изменением.
+
+    on_change вызывается в потоке наблюдателя.
+    """
+
+    def __init__(self, paths, on_change, interval=None, settle=None):
+        self.paths = [os.path.abspath(path) for path in paths if path]
+        self.on_change = on_change
+        self.interval = interval if interval is not None else config.FILE_WATCH_INTERVAL
+        self.settle = settle if settle is not None else config.FILE_WATCH_SETTLE_MS / 1000
+        self.backend = None
+        self._lock = threading.Lock()
+        self._signature = files_signature(self.paths)
+        self._own_writes = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @contextlib.contextmanager
+    def own_write(self):
+        """Запись приложения: пока она идет, проверки откладываются, после нее
+        получившееся состояние файлов считается известным"""
+        with self._lock:
+            self._own_writes += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._own_writes -= 1
+                self._signature = files_signature(self.paths)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                inotify = _Inotify({os.path.dirname(path) for path in self.paths})
+            except (OSError, AttributeError) as e:
+                print(f"inotify недоступен, файлы будут опрашиваться: {e}")
+        self.backend = "inotify" if inotify is not None else "polling"
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(inotify,),
+                                        name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, inotify):
+        names = {os.path.basename(path) for path in self.paths}
+        try:
+            while not self._stop_event.is_set():
+                if inotify is not None:
+                    # Пробуждаемся и без событий, чтобы заметить stop()
+                    if not names & inotify.wait(self.interval):
+                        continue
+                    # Ждем, пока серия событий (запись, переименование) утихнет
+                    while names & inotify.wait(self.settle):
+                        pass
+                elif self._stop_event.wait(self.interval):
+                    return
+                self._check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _check(self):
+        signature = files_signature(self.paths)
+        with self._lock:
+            if self._own_writes or signature == self._signature:
+                return
+            self._signature = signature
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Ошибка обработки изменения файлов: {e}")
@@ -0,0 +1,264 @@
+"""Массовый импорт дедлайнов из CSV и iCalendar (.ics).
+
+Файл читается потоком, строки проверяются пачками по IMPORT_BATCH_SIZE,
+а ошибки собираются по строкам и не прерывают импорт. Большие файлы
+(PARALLEL_IMPORT) читаются блоками по PARALLEL_THRESHOLD строк, и строки
+блока проверяются частями в пуле процессов. Результат записывается
+в хранилище вызывающим кодом одним apply_changes.
+
+CSV: первая строка - заголовок с колонками name (или "Название"),
+deadline ("Дедлайн") и необязательной days_needed ("Дней на выполнение");
+разделитель - запятая или точка с запятой.
+iCalendar: VEVENT (дедлайн - DTEND или DTSTART) и VTODO (DUE или DTSTART),
+название - SUMMARY, дни на выполнение - необязательное свойство X-DAYS-NEEDED.
+"""
+import csv
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+from models.deadline import Deadline
+from utils.parallel import map_chunks
+import config
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9: TZID считается местным временем
+    ZoneInfo = None
+
+# Форматы даты в CSV, кроме ISO 8601
+_DATE_FORMATS = ("%d.%m.%Y %H:%M", "%d.%m.%Y", "%Y-%m-%d %H:%M", "%m/%d/%Y %H:%M", "%m/%d/%Y")
+
+_CSV_COLUMNS = {
+    "name": "name", "название": "name", "summary": "name", "title": "name",
+    "deadline": "deadline", "дедлайн": "deadline", "due": "deadline", "date": "deadline",
+    "days_needed": "days_needed", "дней на выполнение": "days_needed", "days": "days_needed",
+}
+
+# Строка источника: (номер строки, поля name/deadline/days_needed в виде текста)
+SourceRow = Tuple[int, dict]
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    message: str
+
+    def __str__(self):
+        return f"строка {self.line}: {self.message}"
+
+
+@dataclass
+class ImportResult:
+    deadlines: List[Deadline] = field(default_factory=list)
+    errors: List[ImportRowError] = field(default_factory=list)
+    duplicates: int = 0
+
+
+def parse_date(value: str) -> datetime:
+    """Дата дедлайна из CSV: ISO 8601 или один из _DATE_FORMATS"""
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"неизвестный формат даты \"{value}\"")
+
+
+def iter_csv_rows(filename) -> Iterator[SourceRow]:
+    """Читает строки CSV по одной"""
+    with open(filename, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [_CSV_COLUMNS.get(column.strip().lower()) for column in header]
+        if "name" not in columns or "deadline" not in columns:
+            raise ValueError("в заголовке CSV нужны колонки name и deadline")
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            fields = {column: cell for column, cell in zip(columns, row) if column}
+            yield reader.line_num, fields
+
+
+def _unfold_lines(f) -> Iterator[Tuple[int, str]]:
+    """Склеивает продолженные строки iCalendar (начинаются с пробела или табуляции)"""
+    current = None
+    start = 0
+    for number, line in enumerate(f, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = line, number
+    if current is not None:
+        yield start, current
+
+
+def _unescape(value: str) -> str:
+    return (value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",")
+            .replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def parse_ics_datetime(value: str, params: dict) -> datetime:
+    """Значение DTSTART/DTEND/DUE -> наивное местное время"""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        # Дата без времени: срок - конец дня
+        return datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59)
+
+    utc = value.endswith("Z")
+    moment = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    if utc:
+        return moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    tzid = params.get("TZID")
+    if tzid and ZoneInfo is not None:
+        try:
+            return moment.replace(tzinfo=ZoneInfo(tzid)).astimezone().replace(tzinfo=None)
+        except Exception:
+            pass  # неизвестный часовой пояс: считаем время местным
+    return moment
+
+
+def iter_ics_rows(filename) -> Iterator[SourceRow]:
+    """Читает компоненты VEVENT и VTODO по одному"""
+    with open(filename, "r", encoding="utf-8-sig") as f:
+        component = None
+        start = 0
+        properties = {}
+        for number, line in _unfold_lines(f):
+            name, _, value = line.partition(":")
+            name, *raw_params = name.split(";")
+            name = name.upper()
+
+            if name == "BEGIN" and value.upper() in ("VEVENT", "VTODO") and component is None:
+                component, start, properties = value.upper(), number, {}
+            elif name == "END" and value.upper() == component:
+                yield start, _ics_fields(component, properties)
+                component = None
+            elif component is not None and name not in properties:
+                params = dict(p.split("=", 1) for p in raw_params if "=" in p)
+                properties[name] = (value, params)
+
+
+def _ics_fields(component, properties) -> dict:
+    fields = {"name": _unescape(properties.get("SUMMARY", ("", {}))[0])}
+    order = ("DUE", "DTSTART") if component == "VTODO" else ("DTEND", "DTSTART")
+    for name in order:
+        if name in properties:
+            value, params = properties[name]
+            try:
+                fields["deadline"] = parse_ics_datetime(value, params)
+            except ValueError:
+                fields["deadline"] = f"{name}:{value}"
+            break
+    if "X-DAYS-NEEDED" in properties:
+        fields["days_needed"] = properties["X-DAYS-NEEDED"][0]
+    return fields
+
+
+def validate_row(fields: dict) -> Tuple[str, datetime, Optional[int]]:
+    """Проверяет строку источника; ValueError с описанием, если она некорректна"""
+    name = (fields.get("name") or "").strip()
+    if not name:
+        raise ValueError("не заполнено название")
+
+    deadline = fields.get("deadline")
+    if not deadline:
+        raise ValueError("не заполнена дата дедлайна")
+    if not isinstance(deadline, datetime):
+        deadline = parse_date(deadline)
+    if deadline.tzinfo is not None:
+        # Даты с Z или +чч:мм переводятся в местное время, как в parse_ics_datetime:
+        # в приложении все даты без часового пояса
+        deadline = deadline.astimezone().replace(tzinfo=None)
+
+    days_needed = None
+    days_needed_str = str(fields.get("days_needed") or "").strip()
+    if days_needed_str:
+        try:
+            days_needed = int(days_needed_str)
+        except ValueError:
+            raise ValueError("количество дней должно быть числом")
+        if days_needed <= 0:
+            raise ValueError("количество дней должно быть положительным")
+
+    return name, deadline, days_needed
+
+
+def iter_rows(filename) -> Iterator[SourceRow]:
+    """Строки источника по расширению файла"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return iter_csv_rows(filename)
+    if extension in (".ics", ".ical"):
+        return iter_ics_rows(filename)
+    raise ValueError(f"Неподдерживаемый формат файла: {extension}")
+
+
+def _validate_rows(rows) -> list:
+    """(номер строки, проверенные поля или None, текст ошибки или None) для каждой строки"""
+    checked = []
+    for line, fields in rows:
+        try:
+            checked.append((line, validate_row(fields), None))
+        except ValueError as e:
+            checked.append((line, None, str(e)))
+    return checked
+
+
+def _validate_block(rows) -> list:
+    """Проверяет блок строк; с PARALLEL_IMPORT от PARALLEL_THRESHOLD строк - частями в пуле процессов"""
+    if not config.PARALLEL_IMPORT or len(rows) < config.PARALLEL_THRESHOLD:
+        return _validate_rows(rows)
+    size = config.PARALLEL_CHUNK_SIZE
+    # Части возвращаются в исходном порядке, поэтому дубликаты и ошибки те же, что без пула
+    parts = map_chunks(_validate_rows, [rows[start:start + size] for start in range(0, len(rows), size)])
+    return [row for part in parts for row in part]
+
+
+def import_file(filename, existing=(), batch_size=None) -> ImportResult:
+    """Читает и проверяет файл; дедлайны, уже существующие в existing, пропускаются"""
+    batch_size = batch_size or config.IMPORT_BATCH_SIZE
+    if config.PARALLEL_IMPORT:
+        batch_size = max(batch_size, config.PARALLEL_THRESHOLD)
+    result = ImportResult()
+    seen = {(d.name, d.deadline) for d in existing}
+
+    rows = iter_rows(filename)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        for line, fields, error in _validate_block(batch):
+            if error is not None:
+                result.errors.append(ImportRowError(line, error))
+                continue
+            name, deadline, days_needed = fields
+            if (name, deadline) in seen:
+                result.duplicates += 1
+                continue
+            seen.add((name, deadline))
+            result.deadlines.append(Deadline(
+                name=name,
+                deadline=deadline,
+                days_needed=days_needed
+            ))
+    return result
@@ -0,0 +1,294 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, List
+from models.deadline import Deadline, item_id
+from utils.atomic_file import assert_can_wait, atomic_write, file_lock
+from utils.store import DeadlineStore, RecordParser
+import config
+
+
+class JournalFileManager(DeadlineStore):
+    """Хранилище дедлайнов: снимок в JSON файле и журнал изменений рядом с ним.
+
+    Каждое добавление, изменение или удаление дописывает в журнал одну строку,
+    поэтому стоимость записи зависит от размера изменения, а не от числа дедлайнов.
+    Когда журнал вырастает, фоновый поток сворачивает его в новый снимок.
+    Снимок имеет тот же формат, что и у FileManager.
+
+    Записи в журнал и снимок делаются под file_lock файла снимка (сначала
+    она, потом внутренняя блокировка), строки журнала сбрасываются на диск
+    (fsync). Снимок при сжатии строится по памяти этого процесса, поэтому
+    журнал рассчитан на один пишущий процесс; остальные могут только читать.
+    """
+
+    def __init__(self, filename="deadlines.json", compact_threshold=None):
+        self.filename = filename
+        self.journal_filename = filename + ".journal"
+        self.compacting_filename = filename + ".journal.compacting"
+        self.compact_threshold = (compact_threshold if compact_threshold is not None
+                                  else config.JOURNAL_COMPACT_THRESHOLD)
+
+        self._records = {}  # ключ дедлайна -> словарь to_dict()
+        self._journal = None
+        self._journal_size = 0
+        self._lock = threading.Lock()
+        self._compaction = None
+
+    def load_deadlines(self) -> List[Deadline]:
+        """Загружает снимок и применяет к нему журнал"""
+        self._fold_stale_compaction()
+        with self._lock:
+            self._records = {}
+            try:
+                self._journal_size = self._read_files(self._records)
+                return [Deadline.from_dict(item) for item in self._records.values()]
+            except Exception as e:
+                print(f"Ошибка загрузки данных: {e}")
+                return []
+
+    def load_records(self) -> List[dict]:
+        """Снимок с примененным журналом, прочитанный заново с диска (состояние не меняется)"""
+        records = {}
+        self._read_files(records)
+        return list(records.values())
+
+    def record_reader(self) -> Callable[[], Dict[str, dict]]:
+        """Чтение записей, при котором из журнала читаются только дописанные строки"""
+        return _JournalReader(self)
+
+    def _read_files(self, records) -> int:
+        """Читает снимок и журналы в records; возвращает число записей текущего журнала"""
+        self._read_snapshot(records)
+        # Журнал, оставшийся от прерванного сжатия, старше текущего
+        self._replay(self.compacting_filename, records)
+        return self._replay(self.journal_filename, records)
+
+    def _read_snapshot(self, records):
+        if os.path.exists(self.filename):
+            with open(self.filename, "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    records[item_id(item)] = item
+
+    def _fold_stale_compaction(self):
+        """Сворачивает в снимок журнал, оставшийся от аварийного завершения или неудачного сжатия.
+
+        Пока такой журнал лежит на диске, новое сжатие не запускается,
+        и без этого текущий журнал рос бы до следующего полного сохранения.
+        """
+        if self._compaction is not None or not os.path.exists(self.compacting_filename):
+            return
+        try:
+            with file_lock(self.filename), self._lock:
+                if not os.path.exists(self.compacting_filename):
+                    return
+                records = {}
+                self._read_snapshot(records)
+                self._replay(self.compacting_filename, records)
+                self._write_snapshot(list(records.values()))
+                os.remove(self.compacting_filename)
+        except Exception as e:
+            # Журнал остаётся на диске и применяется при каждой загрузке
+            print(f"Ошибка сжатия журнала: {e}")
+
+    def save_deadlines(self, deadlines: List[Deadline]):
+        """Сохраняет полный список дедлайнов как новый снимок"""
+        self.wait_for_compaction()
+        with file_lock(self.filename), self._lock:
+            self._records = {d.id: d.to_dict() for d in deadlines}
+            try:
+                self._close_journal()
+                self._write_snapshot(list(self._records.values()))
+                for path in (self.journal_filename, self.compacting_filename):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._journal_size = 0
+            except Exception as e:
+                raise Exception(f"Ошибка сохранения данных: {e}")
+
+    def add_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Дописывает в журнал добавленный дедлайн"""
+        self._append({"op": "put", "data": deadline.to_dict()})
+
+    def update_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Дописывает в журнал новую версию дедлайна"""
+        self._append({"op": "put", "data": deadline.to_dict()})
+
+    def delete_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Дописывает в журнал удаление дедлайна"""
+        self._append({"op": "delete", "key": deadline.id})
+
+    def apply_changes(self, changes, deadlines: List[Deadline] = None):
+        """Дописывает в журнал пачку изменений одной записью на диск"""
+        records = []
+        for op, deadline in changes:
+            if op == "delete":
+                records.append({"op": "delete", "key": deadline.id})
+            else:
+                records.append({"op": "put", "data": deadline.to_dict()})
+        self._append(*records)
+
+    def wait_for_compaction(self):
+        """Дожидается окончания фонового сжатия журнала"""
+        compaction = self._compaction
+        if compaction is not None:
+            # Сжатие пишет снимок под file_lock: ждать его под ней нельзя
+            assert_can_wait("Ожидание сжатия журнала")
+            compaction.join()
+
+    def close(self):
+        """Закрывает журнал (вызывать при выходе из приложения)"""
+        self.wait_for_compaction()
+        with self._lock:
+            self._close_journal()
+
+    @staticmethod
+    def _apply(record, records):
+        if record["op"] == "put":
+            item = record["data"]
+            records[item_id(item)] = item
+        elif record["op"] == "delete":
+            records.pop(record["key"], None)
+
+    def _replay(self, path, records) -> int:
+        """Применяет записи журнала, возвращает их количество"""
+        if not os.path.exists(path):
+            return 0
+
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Оборванная последняя строка после аварийного завершения
+                    print(f"Пропущена повреждённая запись журнала в {path}")
+                    continue
+                self._apply(record, records)
+                count += 1
+        return count
+
+    def _append(self, *records):
+        if not records:
+            return
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+        with file_lock(self.filename), self._lock:
+            try:
+                if self._journal is None:
+                    self._journal = open(self.journal_filename, "a", encoding="utf-8")
+                self._journal.write(lines)
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            except Exception as e:
+                raise Exception(f"Ошибка сохранения данных: {e}")
+
+            for record in records:
+                self._apply(record, self._records)
+            self._journal_size += len(records)
+
+            if (self._journal_size >= self.compact_threshold and self._compaction is None
+                    and not os.path.exists(self.compacting_filename)):
+                self._start_compaction()
+
+    def _start_compaction(self):
+        """Переключает запись на новый журнал и запускает сжатие старого (под блокировкой)"""
+        self._close_journal()
+        os.replace(self.journal_filename, self.compacting_filename)
+        self._journal_size = 0
+
+        items = list(self._records.values())
+        self._compaction = threading.Thread(target=self._compact, args=(items,), daemon=True)
+        self._compaction.start()
+
+    def _compact(self, items):
+        try:
+            self._write_snapshot(items)
+            with file_lock(self.filename):
+                # Журнал мог уже свернуть при загрузке другой процесс
+                if os.path.exists(self.compacting_filename):
+                    os.remove(self.compacting_filename)
+        except Exception as e:
+            # Журнал остаётся на диске и будет применён при следующей загрузке
+            print(f"Ошибка сжатия журнала: {e}")
+        finally:
+            self._compaction = None
+
+    def _write_snapshot(self, items):
+        atomic_write(self.filename, json.dumps(items, ensure_ascii=False, indent=2))
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def _stat(path):
+    """inode, mtime и размер файла; None, если его нет"""
+    try:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+class _JournalReader:
+    """Повторное чтение записей JournalFileManager (для DiskState).
+
+    Снимок и журнал прерванного сжатия перечитываются, только когда они
+    изменились, и из снимка заново разбираются лишь изменившиеся записи.
+    Из текущего журнала читаются строки, дописанные с прошлого чтения;
+    замененный или укороченный журнал (сжатие, полное сохранение)
+    читается сначала.
+    """
+
+    def __init__(self, store: JournalFileManager):
+        self.store = store
+        self._parser = RecordParser()
+        self._base_signature = None
+        self._base = {}  # снимок с журналом прерванного сжатия
+        self._records = {}  # _base с примененным текущим журналом
+        self._journal_inode = None
+        self._offset = 0  # байт текущего журнала уже применено
+
+    def __call__(self) -> Dict[str, dict]:
+        store = self.store
+        # Подпись берется до чтения: изменение во время чтения заметит следующий вызов
+        base_signature = (_stat(store.filename), _stat(store.compacting_filename))
+        if base_signature != self._base_signature:
+            base = {}
+            if base_signature[0] is not None:
+                with open(store.filename, "r", encoding="utf-8") as f:
+                    base = self._parser.parse_array(f.read())
+            store._replay(store.compacting_filename, base)
+            self._base, self._base_signature = base, base_signature
+            self._journal_inode = None
+
+        journal = _stat(store.journal_filename)
+        if journal is None or journal[0] != self._journal_inode or journal[2] < self._offset:
+            self._records = dict(self._base)
+            self._journal_inode = journal[0] if journal is not None else None
+            self._offset = 0
+        if journal is not None:
+            self._read_tail()
+        return dict(self._records)
+
+    def _read_tail(self):
+        with open(self.store.journal_filename, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Недописанная последняя строка будет прочитана в следующий раз
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").split("\n"):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Пропущена повреждённая запись журнала в {self.store.journal_filename}")
+                continue
+            self.store._apply(record, self._records)
+        self._offset += end
@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterator, List
+from models.collection import DeadlineCollection
+from models.deadline import Deadline
+from utils.atomic_file import atomic_write
+from utils.parallel import load_jsonl_collection
+from utils.store import DeadlineStore, RecordParser
+
+
+class JsonLinesFileManager(DeadlineStore):
+    """Хранилище дедлайнов в формате JSON Lines: один дедлайн на строку.
+
+    Строки записываются отсортированными по дате дедлайна, поэтому чтение
+    идет потоком и может остановиться после первых N дедлайнов, не разбирая
+    остальной файл. Старый deadlines.json переносится автоматически
+    при первом обращении и сохраняется рядом с расширением .bak.
+    """
+
+    partial_load = True
+
+    def __init__(self, filename="deadlines.jsonl", legacy_filename="deadlines.json"):
+        self.filename = filename
+        self.legacy_filename = legacy_filename
+
+    def migrate_legacy_file(self):
+        """Переносит данные из JSON файла, если файла JSON Lines еще нет"""
+        if os.path.exists(self.filename) or not self.legacy_filename:
+            return
+        if not os.path.exists(self.legacy_filename):
+            return
+
+        try:
+            with open(self.legacy_filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._write_items(sorted(data, key=lambda item: datetime.fromisoformat(item["deadline"])))
+            os.replace(self.legacy_filename, self.legacy_filename + ".bak")
+            print(f"Данные перенесены из {self.legacy_filename} в {self.filename}")
+        except Exception as e:
+            print(f"Ошибка переноса данных: {e}")
+
+    def iter_deadlines(self) -> Iterator[Deadline]:
+        """Читает дедлайны по одному в порядке возрастания даты"""
+        self.migrate_legacy_file()
+        if not os.path.exists(self.filename):
+            return
+
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield Deadline.from_dict(json.loads(line))
+
+    def load_deadlines(self, limit=None) -> List[Deadline]:
+        """Загружает дедлайны (первые limit по дате, если limit задан)"""
+        try:
+            return list(islice(self.iter_deadlines(), limit))
+        except Exception as e:
+            print(f"Ошибка загрузки данных: {e}")
+            return []
+
+    def load_records(self) -> List[dict]:
+        """Записи файла как есть, без создания объектов Deadline"""
+        if not os.path.exists(self.filename):
+            return []
+        with open(self.filename, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def record_reader(self) -> Callable[[], Dict[str, dict]]:
+        """Чтение записей, при котором заново разбираются только изменившиеся строки"""
+        parser = RecordParser()
+
+        def read():
+            if not os.path.exists(self.filename):
+                return {}
+            with open(self.filename, "r", encoding="utf-8") as f:
+                return parser.parse(line for line in f.read().split("\n") if line.strip())
+
+        return read
+
+    def load_collection(self) -> DeadlineCollection:
+        """Загружает все дедлайны в DeadlineCollection (большие файлы - в нескольких процессах)"""
+        self.migrate_legacy_file()
+        if not os.path.exists(self.filename):
+            return DeadlineCollection()
+        try:
+            return load_jsonl_collection(self.filename)
+        except Exception as e:
+            print(f"Ошибка загрузки данных: {e}")
+            return DeadlineCollection()
+
+    def save_deadlines(self, deadlines: List[Deadline]):
+        """Сохраняет дедлайны, отсортированные по дате (атомарно, под блокировкой файла)"""
+        try:
+            self._write_items(d.to_dict() for d in sorted(deadlines, key=lambda d: d.deadline))
+        except Exception as e:
+            raise Exception(f"Ошибка сохранения данных: {e}")
+
+    def next_deadlines(self, limit: int, current_time=None) -> List[Deadline]:
+        """Ближайшие непросроченные дедлайны; чтение останавливается после limit найденных"""
+        if current_time is None:
+            current_time = datetime.now()
+        try:
+            upcoming = (d for d in self.iter_deadlines() if d.deadline > current_time)
+            return list(islice(upcoming, limit))
+        except Exception as e:
+            print(f"Ошибка загрузки данных: {e}")
+            return []
+
+    def _write_items(self, items):
+        atomic_write(self.filename, "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items))
@@ -0,0 +1,91 @@
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from models.deadline import Deadline
+
+
+class ExternalChanges(NamedTuple):
+    changed: List[Deadline]  # добавленные или измененные на диске
+    deleted: List[str]  # id удаленных с диска
+
+
+class MergePlan(NamedTuple):
+    puts: List[Deadline]  # версии с диска, которые нужно добавить или подставить
+    deletes: List[Deadline]  # дедлайны в памяти, удаленные на диске
+    conflicts: List[Tuple[Optional[Deadline], Optional[Deadline]]]  # (в памяти, на диске)
+
+
+class DiskState:
+    """Последнее прочитанное содержимое хранилища.
+
+    refresh() перечитывает записи (словари to_dict) функцией из
+    DeadlineStore.record_reader() и сравнивает их с прошлыми по id.
+    Заново разбираются и превращаются в Deadline только изменившиеся
+    записи, так что внешнее изменение одного дедлайна в большом файле
+    не разбирает заново весь список.
+    """
+
+    def __init__(self, read_records: Callable[[], Dict[str, dict]]):
+        self.read_records = read_records
+        self._records: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, own_keys: Optional[Set[str]] = frozenset()) -> Optional[ExternalChanges]:
+        """Изменения с прошлого чтения; None при первом чтении или ошибке.
+
+        Изменения дедлайнов из own_keys (None - всех) только что записало
+        само приложение: они запоминаются как прочитанные и не возвращаются.
+        """
+        with self._lock:
+            return self._refresh(own_keys)
+
+    def _refresh(self, own_keys) -> Optional[ExternalChanges]:
+        try:
+            records = self.read_records()
+        except Exception as e:
+            print(f"Ошибка чтения измененного файла данных: {e}")
+            return None
+
+        previous, self._records = self._records, records
+        if previous is None:
+            return None
+        if own_keys is None:
+            return ExternalChanges([], [])
+
+        # Неизменившиеся записи обычно те же объекты: их сравнение - проверка is
+        changed = [Deadline.from_dict(item) for key, item in records.items()
+                   if previous.get(key) is not item and previous.get(key) != item
+                   and key not in own_keys]
+        deleted = [key for key in previous if key not in records and key not in own_keys]
+        return ExternalChanges(changed, deleted)
+
+
+def plan_merge(changes: ExternalChanges, deadlines_by_id: Dict[str, Deadline],
+               pending_ids: Optional[Set[str]]) -> MergePlan:
+    """Раскладывает внешние изменения на применимые и конфликтующие.
+
+    Изменение конфликтует, если этот же дедлайн изменен в памяти и еще
+    не сохранен (pending_ids; None - несохранен весь список). Изменения,
+    уже совпадающие с памятью (например, собственная запись), пропускаются.
+    """
+    def unsaved(key):
+        return pending_ids is None or key in pending_ids
+
+    puts, deletes, conflicts = [], [], []
+    for deadline in changes.changed:
+        local = deadlines_by_id.get(deadline.id)
+        if local is not None and local.to_dict() == deadline.to_dict():
+            continue
+        if unsaved(deadline.id):
+            conflicts.append((local, deadline))
+        else:
+            puts.append(deadline)
+
+    for key in changes.deleted:
+        local = deadlines_by_id.get(key)
+        if local is None:
+            continue
+        if unsaved(key):
+            conflicts.append((local, None))
+        else:
+            deletes.append(local)
+    return MergePlan(puts, deletes, conflicts)
@@ -0,0 +1,195 @@
+"""Счетчики и гистограммы времени выполнения горячих участков.
+
+    from utils.metrics import metrics
+
+    @metrics.timed("file_save")
+    def save_deadlines(...): ...
+
+Сбор включается настройкой METRICS_ENABLED (или metrics.enabled = True).
+Выключенный декоратор только проверяет один флаг и вызывает функцию.
+Во включенном состоянии фоновый поток раз в METRICS_EXPORT_INTERVAL секунд
+записывает METRICS_FILE в текстовом формате Prometheus и выводит строку
+со сводкой.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from utils.atomic_file import atomic_write
+import config
+
+PREFIX = "deadline_tracker_"
+
+
+class Histogram:
+    """Гистограмма длительностей в секундах с накопленными счетчиками по корзинам"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # последняя корзина - +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q) -> float:
+        """Приближенный квантиль: верхняя граница корзины, в которую он попал"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self, enabled=None, buckets=None):
+        self.enabled = config.METRICS_ENABLED if enabled is None else enabled
+        self.buckets = buckets or config.METRICS_BUCKETS
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}  # имя -> функция, возвращающая текущее значение
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._exporter = None
+
+    def inc(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def gauge(self, name, func):
+        """Регистрирует показатель, значение которого читается при выгрузке"""
+        with self._lock:
+            self.gauges[name] = func
+
+    def _gauge_values(self):
+        with self._lock:
+            gauges = dict(self.gauges)
+        values = {}
+        for name, func in gauges.items():
+            try:
+                values[name] = func()
+            except Exception:
+                continue
+        return values
+
+    def timed(self, name):
+        """Декоратор: число вызовов, ошибок и гистограмма длительности функции"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    self.inc(f"{name}_errors")
+                    raise
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def render_prometheus(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        gauges = self._gauge_values()
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = {name: (h.buckets, list(h.counts), h.sum, h.count)
+                          for name, h in self.histograms.items()}
+
+        lines = []
+        for name in sorted(counters):
+            metric = f"{PREFIX}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counters[name]}")
+        for name in sorted(gauges):
+            metric = f"{PREFIX}{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {gauges[name]}")
+        for name in sorted(histograms):
+            buckets, counts, total, count = histograms[name]
+            metric = f"{PREFIX}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum {total:.6f}")
+            lines.append(f"{metric}_count {count}")
+        return "\n".join(lines) + "\n"
+
+    def summary_line(self) -> str:
+        """Короткая сводка для журнала: вызовы, среднее, p95 и максимум в миллисекундах"""
+        gauges = self._gauge_values()
+        with self._lock:
+            parts = []
+            for name in sorted(self.histograms):
+                h = self.histograms[name]
+                mean = h.sum / h.count * 1000 if h.count else 0.0
+                parts.append(f"{name} n={h.count} avg={mean:.1f}мс "
+                             f"p95<={h.quantile(0.95) * 1000:.0f}мс max={h.max * 1000:.1f}мс")
+            parts.extend(f"{name}={value}" for name, value in sorted(self.counters.items()))
+            parts.extend(f"{name}={value}" for name, value in sorted(gauges.items()))
+        return "Метрики: " + ("; ".join(parts) if parts else "нет данных")
+
+    def write(self, filename=None):
+        """Записывает метрики в файл атомарно (читатель не увидит половину)"""
+        filename = filename or config.METRICS_FILE
+        try:
+            atomic_write(filename, self.render_prometheus())
+        except OSError as e:
+            print(f"Ошибка записи метрик: {e}")
+
+    def export(self):
+        self.write()
+        print(self.summary_line())
+
+    def start_exporter(self, interval=None):
+        """Запускает периодическую выгрузку, если сбор метрик включен"""
+        if not self.enabled or self._exporter is not None:
+            return
+        interval = interval or config.METRICS_EXPORT_INTERVAL
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.export()
+
+        self._exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        self._exporter.start()
+
+    def stop_exporter(self):
+        """Останавливает выгрузку и записывает итоговые значения"""
+        if self._exporter is None:
+            return
+        self._stop_event.set()
+        self._exporter.join()
+        self._exporter = None
+        self.export()
+
+
+# Общий реестр приложения
+metrics = MetricsRegistry()
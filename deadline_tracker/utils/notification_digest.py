@@ -0,0 +1,59 @@
+"""Сводные уведомления о срочных дедлайнах с ограничением частоты.
+
+Все дедлайны, о которых нужно напомнить за один проход проверки,
+сводятся в одно уведомление. Отдельное уведомление получают только
+что ставшие срочными, и то пока не исчерпан лимит: не больше
+limit уведомлений за window секунд, при этом одно место оставляется
+под сводку.
+
+Модуль не зависит от остального пакета: daily_notification.py
+импортирует его как deadline_tracker.utils.notification_digest.
+"""
+from collections import deque
+
+
+class DigestAggregator:
+    def __init__(self, limit, window, max_names):
+        self.limit = limit
+        self.window = window  # секунд
+        self.max_names = max_names  # названий в тексте сводки
+        self._sent = deque()  # время отправленных уведомлений внутри окна
+
+    def available(self, current_time) -> int:
+        """Сколько уведомлений еще можно отправить в текущем окне"""
+        while self._sent and (current_time - self._sent[0]).total_seconds() >= self.window:
+            self._sent.popleft()
+        return max(self.limit - len(self._sent), 0)
+
+    def plan(self, due, is_new, current_time):
+        """Раскладывает дедлайны прохода на (отдельные, сводка) и учитывает их в лимите.
+
+        due - дедлайны, о которых пора напомнить, is_new(дедлайн) - стал ли
+        он срочным только что. Сводка из одного дедлайна становится отдельным
+        уведомлением. Если лимит исчерпан, оба списка пустые: напоминания
+        останутся должными до следующего прохода.
+        """
+        due = list(due)
+        available = self.available(current_time)
+        if not due or not available:
+            return [], []
+
+        new = [item for item in due if is_new(item)]
+        rest = [item for item in due if not is_new(item)]
+        if len(new) + (1 if rest else 0) > available:
+            # Последнее свободное место - под сводку всех остальных
+            new, rest = new[:available - 1], new[available - 1:] + rest
+
+        if len(rest) == 1:
+            new, rest = new + rest, []
+        for _ in range(len(new) + (1 if rest else 0)):
+            self._sent.append(current_time)
+        return new, rest
+
+    def digest_text(self, names) -> str:
+        """Текст сводки: первые max_names названий и число остальных"""
+        names = list(names)
+        lines = [f"• {name}" for name in names[:self.max_names]]
+        if len(names) > self.max_names:
+            lines.append(f"...и еще {len(names) - self.max_names}")
+        return "\n".join(lines)
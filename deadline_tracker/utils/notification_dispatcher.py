@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+import config
+
+
+@dataclass
+class NotificationIntent:
+    """Уведомление, которое нужно показать"""
+    title: str
+    message: str
+    subject: str = ""  # для журнала: о чем уведомление
+
+
+class _BackendWorker:
+    """Поток одного способа доставки уведомлений со своей очередью.
+
+    Зависший или падающий способ доставки не мешает остальным: если вызов
+    длится дольше timeout, новые уведомления для него отбрасываются, а после
+    max_failures ошибок подряд он отключается на retry_after секунд.
+    """
+
+    def __init__(self, name, send, queue_size, timeout, max_failures, retry_after):
+        self.name = name
+        self.send = send
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.busy_since = None
+        self.failures = 0
+        self.disabled_until = 0.0
+        self.dropped = 0
+
+        self.thread = threading.Thread(target=self._run, name=f"notify-{name}", daemon=True)
+        self.thread.start()
+
+    def offer(self, intent: NotificationIntent):
+        """Передает уведомление потоку, не блокируя вызывающего"""
+        now = time.monotonic()
+
+        if now < self.disabled_until:
+            self.dropped += 1
+            return
+
+        busy_since = self.busy_since
+        if busy_since is not None and now - busy_since > self.timeout:
+            self.dropped += 1
+            print(f"Уведомления ({self.name}) не отвечают {now - busy_since:.0f} с, пропускаем")
+            return
+
+        try:
+            self.queue.put_nowait(intent)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            intent = self.queue.get()
+            if intent is None:
+                break
+            if time.monotonic() < self.disabled_until:
+                self.dropped += 1
+                continue
+
+            self.busy_since = time.monotonic()
+            try:
+                self.send(intent)
+                self.failures = 0
+            except Exception as e:
+                self.failures += 1
+                print(f"Ошибка отправки уведомления ({self.name}): {e}")
+                if self.failures >= self.max_failures:
+                    self.disabled_until = time.monotonic() + self.retry_after
+                    self.failures = 0
+                    print(f"Уведомления ({self.name}) отключены на {self.retry_after} с")
+            finally:
+                self.busy_since = None
+
+    def stop(self):
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class NotificationDispatcher:
+    """Очередь уведомлений с отдельным потоком доставки.
+
+    Поток интерфейса только кладет намерение в ограниченную очередь и никогда
+    не ждет: при переполнении уведомление отбрасывается. Поток-диспетчер
+    раздает уведомления способам доставки, у каждого из которых свой поток.
+    """
+
+    def __init__(self, backends, queue_size=None, timeout=None):
+        queue_size = queue_size or config.NOTIFICATION_QUEUE_SIZE
+        timeout = timeout or config.NOTIFICATION_BACKEND_TIMEOUT
+
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._workers = [
+            _BackendWorker(name, send, queue_size, timeout,
+                           config.NOTIFICATION_BACKEND_MAX_FAILURES,
+                           config.NOTIFICATION_BACKEND_RETRY)
+            for name, send in backends.items()
+        ]
+
+        self._thread = threading.Thread(target=self._run, name="notify-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, intent: NotificationIntent) -> bool:
+        """Ставит уведомление в очередь; False, если очередь переполнена"""
+        try:
+            self._queue.put_nowait(intent)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def pending(self) -> int:
+        """Количество уведомлений, ожидающих раздачи"""
+        return self._queue.qsize()
+
+    def stop(self, timeout=1.0):
+        """Останавливает диспетчер, дав ему раздать уже поставленные уведомления"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        for worker in self._workers:
+            worker.stop()
+
+    def _run(self):
+        while True:
+            intent = self._queue.get()
+            if intent is None:
+                break
+            for worker in self._workers:
+                worker.offer(intent)
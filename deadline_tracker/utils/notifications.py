@@ -1,34 +1,96 @@
-from plyer import notification
 from models.deadline import Deadline
+from utils.notification_dispatcher import NotificationDispatcher, NotificationIntent
+from utils.cooldown_store import CooldownStore
+from utils.notification_digest import DigestAggregator
+from utils.metrics import metrics
 import config
 
 
+@metrics.timed("notification_delivery")
+def send_plyer_notification(intent: NotificationIntent):
+    """Показывает системное уведомление через plyer (выполняется в потоке доставки)"""
+    # plyer загружается при первом уведомлении, а не при запуске приложения
+    from plyer import notification
+    notification.notify(
+        title=intent.title,
+        message=intent.message,
+        timeout=config.NOTIFICATION_TIMEOUT,
+        toast=True
+    )
+    print(f"Уведомление отправлено для: {intent.subject}")
+
+
 class NotificationManager:
-    def __init__(self):
-        self.last_notification_time = {}
+    def __init__(self, dispatcher=None, cooldowns=None, digest=None):
+        # Время последних уведомлений переживает перезапуск приложения
+        if cooldowns is None:
+            cooldowns = CooldownStore()
+            cooldowns.load()
+        self.cooldowns = cooldowns
+        if dispatcher is None:
+            dispatcher = NotificationDispatcher({"plyer": send_plyer_notification})
+        self.dispatcher = dispatcher
+        if digest is None:
+            digest = DigestAggregator(config.NOTIFICATION_RATE_LIMIT, config.NOTIFICATION_RATE_WINDOW,
+                                      config.NOTIFICATION_DIGEST_MAX_NAMES)
+        self.digest = digest
+
+    def notify_urgent(self, deadlines, current_time, newly_urgent=()):
+        """Уведомляет о срочных дедлайнах одного прохода проверки.
 
+        Дедлайны, у которых истек интервал между уведомлениями, сводятся
+        в одно уведомление; отдельное получают только id из newly_urgent
+        (ставшие срочными в этом проходе), в пределах лимита частоты.
+        """
+        # Окно и демон делят файл времен: проверка и отметка идут под его блокировкой,
+        # и дедлайн, о котором только что уведомил другой процесс, пропускается
+        with self.cooldowns.transaction():
+            due = [d for d in deadlines if self.should_send_notification(d.id, current_time)]
+            individual, digested = self.digest.plan(due, lambda d: d.id in newly_urgent, current_time)
+            if len(due) > len(individual) + len(digested):
+                metrics.inc("notifications_rate_limited", len(due) - len(individual) - len(digested))
+
+            for deadline in individual:
+                self.send_urgent_notification(deadline)
+            if digested:
+                self.send_digest_notification(digested)
+                metrics.inc("notifications_digested", len(digested))
+            for deadline in individual + digested:
+                self.update_notification_time(deadline.id, current_time)
+
+    @metrics.timed("send_urgent_notification")
     def send_urgent_notification(self, deadline: Deadline):
-        """Отправляет уведомление для срочного дедлайна"""
-        try:
-            days_remaining = (deadline.deadline - deadline.created).days
-
-            notification.notify(
-                title="⚠️ СРОЧНЫЙ ДЕДЛАЙН!",
-                message=(
-                    f"'{deadline.name}'\n"
-                    f"Осталось {days_remaining} дн.\n"
-                    f"Нужно {deadline.days_needed} дн. на выполнение!"
-                ),
-                timeout=config.NOTIFICATION_TIMEOUT,
-                toast=True
-            )
-            print(f"Уведомление отправлено для: {deadline.name}")
-        except Exception as e:
-            print(f"Ошибка отправки уведомления: {e}")
-
-    def should_send_notification(self, deadline_name: str, current_time) -> bool:
+        """Ставит в очередь уведомление для срочного дедлайна (не блокирует)"""
+        days_remaining = (deadline.deadline - deadline.created).days
+
+        intent = NotificationIntent(
+            title="⚠️ СРОЧНЫЙ ДЕДЛАЙН!",
+            message=(
+                f"'{deadline.name}'\n"
+                f"Осталось {days_remaining} дн.\n"
+                f"Нужно {deadline.days_needed} дн. на выполнение!"
+            ),
+            subject=deadline.name
+        )
+        if not self.dispatcher.submit(intent):
+            metrics.inc("notifications_dropped")
+            print(f"Очередь уведомлений переполнена, пропущено: {deadline.name}")
+
+    def send_digest_notification(self, deadlines):
+        """Ставит в очередь одно уведомление сразу о нескольких срочных дедлайнах"""
+        deadlines = sorted(deadlines, key=lambda d: d.deadline)
+        intent = NotificationIntent(
+            title=f"⚠️ Срочных дедлайнов: {len(deadlines)}",
+            message=self.digest.digest_text(d.name for d in deadlines),
+            subject=f"сводка ({len(deadlines)})"
+        )
+        if not self.dispatcher.submit(intent):
+            metrics.inc("notifications_dropped")
+            print(f"Очередь уведомлений переполнена, пропущена сводка из {len(deadlines)} дедлайнов")
+
+    def should_send_notification(self, deadline_key: str, current_time) -> bool:
         """Проверяет, можно ли отправлять уведомление (не чаще чем раз в час)"""
-        last_notified = self.last_notification_time.get(deadline_name)
+        last_notified = self.cooldowns.get(deadline_key)
 
         if last_notified is None:
             return True
@@ -36,6 +98,20 @@ class NotificationManager:
         time_since_last = (current_time - last_notified).total_seconds()
         return time_since_last >= config.NOTIFICATION_COOLDOWN
 
-    def update_notification_time(self, deadline_name: str, current_time):
+    def update_notification_time(self, deadline_key: str, current_time):
         """Обновляет время последнего уведомления"""
-        self.last_notification_time[deadline_name] = current_time
\ No newline at end of file
+        self.cooldowns.set(deadline_key, current_time)
+
+    def forget(self, deadline_key: str):
+        """Забывает время уведомлений удаленного дедлайна"""
+        self.cooldowns.discard(deadline_key)
+
+    def save_state(self, current_time, active_keys=None):
+        """Вытесняет истекшие записи (и записи не из active_keys) и сохраняет изменения"""
+        self.cooldowns.evict(current_time, active_keys)
+        self.cooldowns.save()
+
+    def close(self):
+        """Сохраняет время уведомлений и останавливает поток доставки"""
+        self.cooldowns.save()
+        self.dispatcher.stop()
\ No newline at end of file
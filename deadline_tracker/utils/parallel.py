@@ -0,0 +1,158 @@
+"""Необязательная обработка больших наборов дедлайнов в нескольких процессах.
+
+Данные делятся на части по PARALLEL_CHUNK_SIZE, части обрабатываются
+в пуле процессов, а результаты собираются в исходном порядке частей,
+поэтому результат не зависит от того, какой процесс закончил первым.
+Меньше PARALLEL_THRESHOLD элементов (или при одном ядре) все считается
+в текущем процессе: запуск пула и передача данных стоят дороже.
+
+Между процессами передаются только границы частей и массивы чисел
+(DeadlineCollection), а не объекты Deadline или словари: их сериализация
+занимает больше времени, чем сам разбор дат.
+
+Процессы пула запускаются через forkserver (или spawn, где его нет), а не
+fork: fork копирует процесс окна вместе с потоками записи и наблюдения за
+файлом и их захваченными блокировками.
+"""
+import json
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+from models.collection import DeadlineCollection, NO_DAYS_NEEDED, to_epoch_us
+import config
+
+DAY_US = 24 * 60 * 60 * 1_000_000
+
+
+def worker_count() -> int:
+    """Число процессов для пула (config.PARALLEL_WORKERS или число доступных ядер)"""
+    if config.PARALLEL_WORKERS:
+        return config.PARALLEL_WORKERS
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def map_chunks(func, chunks, *args, workers=None) -> list:
+    """Результаты func(chunk, *args) для каждой части, в порядке частей.
+
+    func должна быть функцией уровня модуля, а данные - сериализуемыми pickle.
+    """
+    workers = min(workers or worker_count(), len(chunks))
+    if workers <= 1:
+        return [func(chunk, *args) for chunk in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+        # map возвращает результаты в порядке частей
+        return list(executor.map(func, chunks, *([arg] * len(chunks) for arg in args)))
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _split(count, threshold, chunk_size):
+    """Границы частей [start, stop); одна часть, если элементов меньше порога"""
+    threshold = config.PARALLEL_THRESHOLD if threshold is None else threshold
+    chunk_size = chunk_size or config.PARALLEL_CHUNK_SIZE
+    if count < threshold:
+        return [(0, count)]
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _parse_jsonl_range(chunk) -> DeadlineCollection:
+    """Дедлайны из строк файла JSON Lines, которые начинаются в диапазоне [start, stop)"""
+    filename, start, stop = chunk
+    with open(filename, "rb") as f:
+        if start > 0:
+            # Строка, начатая до start, принадлежит предыдущей части
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        if position >= stop:
+            return DeadlineCollection()
+        data = f.read(stop - position)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+    return DeadlineCollection.from_dicts(json.loads(line) for line in data.splitlines() if line.strip())
+
+
+def _estimate_lines(filename, size, sample_bytes=64 * 1024) -> int:
+    """Число строк файла по средней длине строки в его начале"""
+    with open(filename, "rb") as f:
+        sample = f.read(sample_bytes)
+    lines = sample.count(b"\n")
+    if len(sample) >= size:
+        return lines
+    return size * max(lines, 1) // len(sample)
+
+
+def load_jsonl_collection(filename, workers=None, chunk_bytes=None, threshold=None) -> DeadlineCollection:
+    """Читает файл JSON Lines в DeadlineCollection, разбирая части файла в нескольких процессах.
+
+    Процессы получают только имя файла и границы части и сами читают свои
+    строки, обратно передаются массивы коллекции. Файл меньше одной части
+    или, по оценке, меньше threshold строк разбирается в текущем процессе.
+    """
+    threshold = config.PARALLEL_THRESHOLD if threshold is None else threshold
+    chunk_bytes = chunk_bytes or config.PARALLEL_CHUNK_BYTES
+    size = os.path.getsize(filename)
+    if size and _estimate_lines(filename, size) < threshold:
+        chunk_bytes = size
+    chunks = [(filename, start, min(start + chunk_bytes, size))
+              for start in range(0, size, chunk_bytes)]
+
+    collection = DeadlineCollection()
+    for part in map_chunks(_parse_jsonl_range, chunks, workers=workers):
+        collection.merge(part)
+    return collection
+
+
+@dataclass
+class UrgencyReport:
+    """Сводка по набору дедлайнов на момент времени"""
+    total: int = 0
+    urgent: List[int] = field(default_factory=list)  # номера срочных дедлайнов
+    overdue: List[int] = field(default_factory=list)  # номера просроченных дедлайнов
+
+
+def _urgency_chunk(columns, now_us):
+    # Те же правила, что в Deadline.is_urgent и is_overdue; номера внутри части
+    deadline_us, days_needed = columns
+    urgent = []
+    overdue = []
+    for index, (deadline, days) in enumerate(zip(deadline_us, days_needed)):
+        if days != NO_DAYS_NEEDED and (deadline - now_us) // DAY_US < days:
+            urgent.append(index)
+        if deadline <= now_us:
+            overdue.append(index)
+    return urgent, overdue
+
+
+def urgency_report(deadlines, current_time=None, threshold=None, workers=None,
+                   chunk_size=None) -> UrgencyReport:
+    """Срочные и просроченные дедлайны всего набора (Deadline или DeadlineCollection)"""
+    if current_time is None:
+        current_time = datetime.now()
+    if isinstance(deadlines, DeadlineCollection):
+        deadline_us, days_needed = deadlines.deadline_us, deadlines.days_needed
+    else:
+        deadline_us = array("q", (to_epoch_us(d.deadline) for d in deadlines))
+        days_needed = array("i", (NO_DAYS_NEEDED if d.days_needed is None else d.days_needed
+                                  for d in deadlines))
+
+    bounds = _split(len(deadline_us), threshold, chunk_size)
+    chunks = [(deadline_us[start:stop], days_needed[start:stop]) for start, stop in bounds]
+    parts = map_chunks(_urgency_chunk, chunks, to_epoch_us(current_time), workers=workers)
+
+    report = UrgencyReport(total=len(deadline_us))
+    for (start, _), (urgent, overdue) in zip(bounds, parts):
+        report.urgent.extend(start + index for index in urgent)
+        report.overdue.extend(start + index for index in overdue)
+    return report
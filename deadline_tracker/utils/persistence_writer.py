@@ -0,0 +1,226 @@
+import contextlib
+import threading
+import time
+from typing import List
+from models.deadline import Deadline
+from utils.atomic_file import assert_can_wait
+from utils.store import DeadlineStore
+import config
+
+
+class DebouncedStoreWriter(DeadlineStore):
+    """Обертка над хранилищем, которая пишет на диск из фонового потока.
+
+    Добавления, изменения и удаления только запоминаются, а поток записи
+    ждет, пока серия изменений утихнет (debounce секунд без новых изменений,
+    но не дольше max_delay), и сохраняет её одним вызовом apply_changes.
+    Несколько изменений одного дедлайна сворачиваются в последнее.
+    Каждая запись выполняется внутри write_guard() (например,
+    FileWatcher.own_write), если он задан.
+
+    Поток окна передает только ссылку на список: копию для записи делает
+    поток записи. Дедлайны после передачи не меняются (редактирование
+    заменяет дедлайн копией), поэтому поток записи читает их без блокировок.
+    """
+
+    def __init__(self, store: DeadlineStore, debounce=None, max_delay=None, write_guard=None):
+        self.store = store
+        self.write_guard = write_guard or contextlib.nullcontext
+        self.debounce = debounce if debounce is not None else config.SAVE_DEBOUNCE_MS / 1000
+        self.max_delay = max_delay if max_delay is not None else config.SAVE_MAX_DELAY_MS / 1000
+
+        self._condition = threading.Condition()
+        self._pending = {}  # ключ дедлайна -> ("put" или "delete", дедлайн)
+        self._source = None  # последний переданный список; копируется потоком записи
+        self._full_save = False
+        self._first_change = None
+        self._last_change = None
+        self._writing = False
+        self._in_flight = set()  # id дедлайнов в идущей записи; None - пишется весь список
+        self._closed = False
+        self._errors = 0
+        self._close_failures = 0
+        self.unsaved = 0  # изменений, от которых отказались после неудачных попыток при закрытии
+
+        self._thread = threading.Thread(target=self._run, name="store-writer", daemon=True)
+        self._thread.start()
+
+    def load_deadlines(self) -> List[Deadline]:
+        self.flush()
+        return self.store.load_deadlines()
+
+    def save_deadlines(self, deadlines: List[Deadline]):
+        """Запоминает полный список; будет сохранен целиком"""
+        with self._condition:
+            self._pending.clear()
+            self._full_save = True
+            self._touch(deadlines)
+
+    def add_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        self._enqueue("put", deadline, deadlines)
+
+    def update_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        self._enqueue("put", deadline, deadlines)
+
+    def delete_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        self._enqueue("delete", deadline, deadlines)
+
+    def apply_changes(self, changes, deadlines: List[Deadline]):
+        with self._condition:
+            for op, deadline in changes:
+                self._pending.pop(deadline.id, None)
+                self._pending[deadline.id] = (op, deadline)
+            self._touch(deadlines)
+
+    def next_deadlines(self, limit: int, current_time=None) -> List[Deadline]:
+        self.flush()
+        return self.store.next_deadlines(limit, current_time)
+
+    def urgent_deadlines(self, current_time=None) -> List[Deadline]:
+        self.flush()
+        return self.store.urgent_deadlines(current_time)
+
+    def next_urgent_time(self, current_time=None):
+        self.flush()
+        return self.store.next_urgent_time(current_time)
+
+    @property
+    def indexed(self):
+        return self.store.indexed
+
+    @property
+    def partial_load(self):
+        return self.store.partial_load
+
+    def has_pending(self) -> bool:
+        """Есть ли несохраненные изменения"""
+        with self._condition:
+            return self._has_pending() or self._writing
+
+    def pending_ids(self):
+        """id дедлайнов с несохраненными изменениями; None, если не сохранен весь список"""
+        with self._condition:
+            if self._full_save or (self._writing and self._in_flight is None):
+                return None
+            return set(self._pending) | self._in_flight
+
+    def writing_ids(self):
+        """id дедлайнов в идущей записи (для write_guard); None, если пишется весь список"""
+        with self._condition:
+            return None if self._in_flight is None else set(self._in_flight)
+
+    def flush(self):
+        """Сохраняет накопленные изменения немедленно и ждет окончания записи"""
+        assert_can_wait("Ожидание записи изменений")
+        with self._condition:
+            errors = self._errors
+            if self._has_pending():
+                self._first_change = self._last_change = float("-inf")
+                self._condition.notify_all()
+            # После ошибки записи не ждем бесконечно: изменения останутся в очереди
+            while (self._has_pending() or self._writing) and self._errors == errors:
+                self._condition.wait()
+
+    def close(self):
+        """Сохраняет все изменения, останавливает поток записи и закрывает хранилище.
+
+        Если запись не удается, после SAVE_CLOSE_ATTEMPTS попыток изменения
+        отбрасываются, а close сообщает о них исключением, а не ждет вечно.
+        """
+        self.flush()
+        assert_can_wait("Ожидание потока записи")
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(config.SAVE_CLOSE_TIMEOUT_MS / 1000)
+        if self._thread.is_alive():
+            # Хранилище не закрываем: поток записи еще работает с ним
+            raise Exception("Ошибка сохранения данных: запись не завершилась при закрытии")
+        self.store.close()
+        if self.unsaved:
+            raise Exception(f"Ошибка сохранения данных: не сохранено изменений: {self.unsaved}")
+
+    def _enqueue(self, op, deadline, deadlines):
+        self.apply_changes([(op, deadline)], deadlines)
+
+    def _touch(self, deadlines):
+        """Отмечает новое изменение (вызывается под блокировкой)"""
+        self._source = deadlines
+        now = time.monotonic()
+        if self._first_change is None:
+            self._first_change = now
+        self._last_change = now
+        self._condition.notify_all()
+
+    def _give_up(self, changes, full_save, snapshot):
+        """Отказывается от несохраняемых изменений при закрытии (вызывается под блокировкой)"""
+        if full_save or self._full_save:
+            self.unsaved = len(snapshot if snapshot is not None else self._source or ())
+        else:
+            self.unsaved = len({deadline.id for _, deadline in changes} | set(self._pending))
+        print(f"Изменения не сохранены после {self._close_failures} попыток: {self.unsaved}")
+        self._pending = {}
+        self._full_save = False
+        self._first_change = self._last_change = None
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending) or self._full_save
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._has_pending() and not self._closed:
+                    self._condition.wait()
+                if self._closed and not self._has_pending():
+                    return
+
+                # Ждем, пока серия изменений утихнет
+                while True:
+                    now = time.monotonic()
+                    due = min(self._last_change + self.debounce,
+                              self._first_change + self.max_delay)
+                    if now >= due or self._closed:
+                        break
+                    self._condition.wait(due - now)
+
+                changes = list(self._pending.values())
+                source = self._source
+                full_save = self._full_save
+                self._pending = {}
+                self._full_save = False
+                self._first_change = self._last_change = None
+                self._writing = True
+                self._in_flight = None if full_save else {deadline.id for _, deadline in changes}
+
+            # Срез списка - одна операция, и изменения из потока окна не разрывают копию
+            snapshot = source[:] if source is not None else None
+            try:
+                with self.write_guard():
+                    # Полный список уже содержит все последующие изменения
+                    if full_save:
+                        self.store.save_deadlines(snapshot)
+                    elif changes:
+                        self.store.apply_changes(changes, snapshot)
+            except Exception as e:
+                print(f"Ошибка сохранения данных: {e}")
+                # Оставляем изменения для следующей попытки, если их не перекрыли новые
+                with self._condition:
+                    self._errors += 1
+                    if self._closed:
+                        self._close_failures += 1
+                        if self._close_failures >= config.SAVE_CLOSE_ATTEMPTS:
+                            self._give_up(changes, full_save, snapshot)
+                            continue
+                        # Повтор с нарастающей паузой, а не в плотном цикле
+                        self._condition.wait(0.1 * 2 ** (self._close_failures - 1))
+                    for op, deadline in changes:
+                        self._pending.setdefault(deadline.id, (op, deadline))
+                    self._full_save = self._full_save or full_save
+                    if self._source is None:
+                        self._source = snapshot
+                    self._touch(self._source)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._in_flight = set()
+                    self._condition.notify_all()
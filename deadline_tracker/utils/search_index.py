@@ -0,0 +1,289 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Слова названия без учета регистра"""
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+# Узел, под которым больше слов, запоминает объединение их id при первом поиске
+_HEAVY_NODE_WORDS = 32
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids", "union")
+
+    def __init__(self):
+        self.children: Optional[Dict[str, "_TrieNode"]] = None  # создается при первом потомке
+        self.ids: Optional[Set[str]] = None  # у узла, где заканчивается слово: его множество из индекса слов
+        self.union: Optional[Set[str]] = None  # у тяжелого узла: id всех слов поддерева
+
+
+class NameSearchIndex:
+    """Поиск дедлайнов по началу слов названия.
+
+    Индекс слов хранит id дедлайнов для каждого целого слова. Префиксное
+    дерево ссылается на те же множества только из узлов, где слово
+    заканчивается, промежуточные узлы id не хранят. Поиск по началу слова
+    объединяет множества слов поддерева; узел, под которым больше
+    _HEAVY_NODE_WORDS слов (например, "1" над тысячами номеров), при первом
+    поиске запоминает это объединение. Если в запросе есть целые слова,
+    их пересечение пересекается с каждым множеством незаконченного слова.
+    При добавлении, изменении и удалении обновляются только слова этого
+    дедлайна (и объединения на их пути).
+    """
+
+    def __init__(self, deadlines: Iterable = ()):
+        self._root = _TrieNode()
+        self._tokens: Dict[str, Set[str]] = {}  # слово -> id дедлайнов
+        self._names: Dict[str, str] = {}  # id дедлайна -> " слово слово" его названия
+        self._has_unions = False  # запомнено ли хоть одно объединение
+        self._source = None
+        self._build(deadlines)
+
+    def rebuild(self, deadlines: Iterable):
+        """Откладывает построение индекса до первого поиска.
+
+        deadlines должен быть тем же списком, который потом изменяется:
+        до построения add, remove и update ничего не делают, а индекс
+        строится по текущему содержимому списка.
+        """
+        self._source = deadlines
+
+    def _build(self, deadlines: Iterable):
+        self._root = _TrieNode()
+        self._tokens = {}
+        self._names = {}
+        self._has_unions = False
+        self._source = None
+        for deadline in deadlines:
+            self._add(deadline)
+
+    def _ensure_built(self):
+        if self._source is not None:
+            self._build(self._source)
+
+    def add(self, deadline):
+        if self._source is None:
+            self._add(deadline)
+
+    def _add(self, deadline):
+        tokens = tokenize(deadline.name)
+        # Пробел перед каждым словом: начало слова ищется подстрокой " префикс"
+        self._names[deadline.id] = "".join(" " + token for token in tokens)
+        for token in tokens:
+            ids = self._tokens.get(token)
+            if ids is None:
+                ids = self._tokens[token] = set()
+                self._add_path(token, ids)
+            ids.add(deadline.id)
+            if self._has_unions:
+                for node in self._path(token):
+                    if node.union is not None:
+                        node.union.add(deadline.id)
+
+    def _add_path(self, token, ids):
+        node = self._root
+        for char in token:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        node.ids = ids
+
+    def remove(self, deadline):
+        if self._source is not None:
+            return
+        names = self._names.pop(deadline.id, None)
+        if names is None:
+            return
+        for token in names.split():
+            if self._has_unions:
+                # id может остаться в объединении через другое слово: считаем заново
+                for node in self._path(token):
+                    node.union = None
+            ids = self._tokens[token]
+            ids.discard(deadline.id)
+            if not ids:
+                del self._tokens[token]
+                self._remove_path(token)
+
+    def update(self, deadline):
+        """Переиндексирует дедлайн после редактирования (только если название изменилось)"""
+        if self._source is not None:
+            return
+        if set(self._names.get(deadline.id, "").split()) == tokenize(deadline.name):
+            return
+        self.remove(deadline)
+        self._add(deadline)
+
+    def _path(self, token) -> List[_TrieNode]:
+        """Узлы от корня до конца слова, которое есть в индексе"""
+        path = [self._root]
+        for char in token:
+            path.append(path[-1].children[char])
+        return path
+
+    def _remove_path(self, token):
+        path = self._path(token)
+        path[-1].ids = None
+        # Удаляем узлы, под которыми не осталось слов, снизу вверх
+        for depth in range(len(token), 0, -1):
+            node = path[depth]
+            if node.ids is not None or node.children:
+                break
+            parent = path[depth - 1]
+            del parent.children[token[depth - 1]]
+            if not parent.children:
+                parent.children = None
+
+    def _prefix_sets(self, prefix) -> List[Set[str]]:
+        """Множества id всех слов, начинающихся с prefix (изменять их нельзя)"""
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char) if node.children else None
+            if node is None:
+                return []
+        if node.union is not None:
+            return [node.union]
+        top = node
+        sets = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.ids is not None:
+                sets.append(node.ids)
+            if node.children:
+                stack.extend(node.children.values())
+        if len(sets) > _HEAVY_NODE_WORDS:
+            top.union = set().union(*sets)
+            self._has_unions = True
+            return [top.union]
+        return sets
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """id дедлайнов, подходящих под запрос, или None, если запрос пустой.
+
+        Каждое слово запроса должно совпасть с началом какого-то слова
+        названия; слово, после которого уже набран пробел, должно совпасть
+        целиком.
+        """
+        words = _TOKEN_RE.findall(query.casefold())
+        if not words:
+            return None
+        self._ensure_built()
+
+        complete = words if not query[-1:].isalnum() and query[-1:] != "_" else words[:-1]
+        prefix = words[-1] if len(complete) < len(words) else None
+        if complete:
+            # Пересечение начинается с самого маленького множества
+            candidates = sorted((self._tokens.get(word, set()) for word in complete), key=len)
+            result = candidates[0]
+            for ids in candidates[1:]:
+                if not result:
+                    break
+                result = result & ids
+            if prefix is not None and result:
+                # Пересечение обходит меньшее из множеств, объединение слов не строится
+                matched = set()
+                for ids in self._prefix_sets(prefix):
+                    matched |= result & ids
+                result = matched
+            # Множества индекса наружу не отдаются
+            return set(result) if result is candidates[0] else result
+
+        sets = self._prefix_sets(prefix)
+        if len(sets) == 1:
+            return set(sets[0])
+        return set().union(*sets)
+
+    def __len__(self):
+        self._ensure_built()
+        return len(self._names)
+
+
+class MatchPositions:
+    """Возрастающие позиции найденных дедлайнов, вычисляемые по мере обращения.
+
+    Длина известна сразу (число найденных), а позиции находятся просмотром
+    списка по порядку до запрошенной: экрану виртуального списка в начале
+    нужно просмотреть лишь несколько сотен дедлайнов, а не сортировать
+    позиции всех найденных.
+    """
+
+    _CHUNK = 256
+
+    def __init__(self, matches: Set[str], deadlines):
+        self._matches = matches
+        self._deadlines = deadlines
+        self._found: List[int] = []
+        self._scanned = 0
+
+    def _scan_until(self, count):
+        matches, found = self._matches, self._found
+        while len(found) < count and self._scanned < len(self._deadlines):
+            start = self._scanned
+            chunk = self._deadlines[start:start + self._CHUNK]
+            found.extend(position for position, deadline in enumerate(chunk, start)
+                         if deadline.id in matches)
+            self._scanned = start + len(chunk)
+
+    def __len__(self):
+        return len(self._matches)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            if indices:
+                self._scan_until(max(indices[0], indices[-1]) + 1)
+            return [self._found[i] for i in indices]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("позиция вне списка найденных")
+        self._scan_until(index + 1)
+        return self._found[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class SearchFilter:
+    """Позиции дедлайнов SortedDeadlines, подходящих под запрос.
+
+    Если найдено немного, позиция каждого id берется из словаря, который
+    запоминается до следующего изменения списка (по его version), и
+    позиции сортируются. Если найдено много, позиции отдаются лениво
+    (MatchPositions): просмотр списка до конца экрана дешевле сортировки.
+    """
+
+    # Найденных больше sqrt(PAGE * размер списка): на одну страницу
+    # из PAGE строк в среднем приходится меньше найденных, чем их всего
+    PAGE = 64
+
+    def __init__(self, index: NameSearchIndex):
+        self.index = index
+        self._positions = None  # (список, его версия, id -> позиция)
+
+    def _position_map(self, deadlines) -> Dict[str, int]:
+        cached = self._positions
+        if cached is not None and cached[0] is deadlines and cached[1] == deadlines.version:
+            return cached[2]
+        positions = {deadline.id: index for index, deadline in enumerate(deadlines)}
+        self._positions = (deadlines, deadlines.version, positions)
+        return positions
+
+    def positions(self, query: str, deadlines):
+        """Возрастающие позиции найденных в deadlines; все позиции для пустого запроса"""
+        matches = self.index.search(query)
+        if matches is None:
+            return range(len(deadlines))
+        if len(matches) ** 2 > self.PAGE * len(deadlines):
+            return MatchPositions(matches, deadlines)
+        return sorted(map(self._position_map(deadlines).__getitem__, matches))
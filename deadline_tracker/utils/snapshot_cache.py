@@ -0,0 +1,165 @@
+import os
+import pickle
+from datetime import datetime
+from typing import List, Optional
+from models.deadline import Deadline
+from utils.atomic_file import atomic_write, file_lock
+from utils.store import DeadlineStore
+
+CACHE_VERSION = 1
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Разрешает из классов только datetime: чужой файл кэша не сможет выполнить код"""
+
+    def find_class(self, module, name):
+        if (module, name) == ("datetime", "datetime"):
+            return datetime
+        raise pickle.UnpicklingError(f"недопустимый класс в кэше: {module}.{name}")
+
+
+class SnapshotCache:
+    """Двоичный снимок разобранных дедлайнов рядом с файлом данных.
+
+    Хранит кортежи полей (pickle разбирает их в несколько раз быстрее,
+    чем JSON с датами в ISO) и подпись исходных файлов: путь, mtime и размер.
+    Если хотя бы один исходный файл изменился, снимок не используется.
+    """
+
+    def __init__(self, filename, sources):
+        self.filename = filename
+        self.sources = [path for path in sources if path]
+
+    def signature(self):
+        signature = []
+        for path in self.sources:
+            try:
+                stat = os.stat(path)
+                signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((os.path.abspath(path), None, None))
+        return tuple(signature)
+
+    def load(self) -> Optional[List[Deadline]]:
+        """Дедлайны из снимка или None, если снимка нет или он устарел"""
+        try:
+            with open(self.filename, "rb") as f:
+                version, signature, rows = _SnapshotUnpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ошибка чтения кэша данных: {e}")
+            return None
+
+        if version != CACHE_VERSION or signature != self.signature():
+            return None
+        return [Deadline(*row) for row in rows]
+
+    def save(self, deadlines: List[Deadline], signature=None):
+        """Записывает снимок; signature - подпись источника на момент, когда он совпадал с deadlines"""
+        if signature is None:
+            signature = self.signature()
+        rows = [(d.name, d.deadline, d.days_needed, d.created, d.id) for d in deadlines]
+        try:
+            atomic_write(self.filename, pickle.dumps((CACHE_VERSION, signature, rows),
+                                                     protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"Ошибка записи кэша данных: {e}")
+
+
+class CachedStore(DeadlineStore):
+    """Обертка над хранилищем, которая загружает дедлайны из снимка SnapshotCache.
+
+    Изменения передаются хранилищу как есть, а снимок записывается при
+    закрытии по последнему сохраненному списку с подписью файлов, снятой
+    сразу после этой записи (под блокировкой файла). Если после нее файлы
+    изменил кто-то другой, снимок не записывается: иначе он скрыл бы чужие
+    изменения. Если приложение завершится аварийно, подпись снимка
+    не совпадет с файлами и данные будут разобраны заново.
+    """
+
+    def __init__(self, store: DeadlineStore, cache_filename=None):
+        self.store = store
+        filename = getattr(store, "filename", None)
+        sources = [filename, getattr(store, "journal_filename", None)]
+        if cache_filename is None:
+            cache_filename = os.path.splitext(filename)[0] + ".cache"
+        self.cache = SnapshotCache(cache_filename, sources)
+        self._lock_filename = filename
+        self._latest = None  # список, который хранилище сохранило последним
+        self._latest_signature = None  # подпись файлов сразу после этой записи
+
+    def load_deadlines(self) -> List[Deadline]:
+        deadlines = self.cache.load()
+        if deadlines is not None:
+            return deadlines
+
+        # Подпись снимается до чтения: изменения во время чтения сделают снимок устаревшим
+        signature = self.cache.signature()
+        deadlines = self.store.load_deadlines()
+        if deadlines:
+            # Пустой результат может означать и ошибку чтения, такой снимок не нужен
+            self.cache.save(deadlines, signature)
+        return deadlines
+
+    def save_deadlines(self, deadlines: List[Deadline]):
+        # Сжатие журнала пишет снимок под той же блокировкой файла: дожидаться его,
+        # уже держа блокировку, значит ждать вечно
+        wait_for_compaction = getattr(self.store, "wait_for_compaction", None)
+        if wait_for_compaction is not None:
+            wait_for_compaction()
+        with file_lock(self._lock_filename):
+            self.store.save_deadlines(deadlines)
+            self._written(deadlines)
+
+    def add_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        with file_lock(self._lock_filename):
+            self.store.add_deadline(deadline, deadlines)
+            self._written(deadlines)
+
+    def update_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        with file_lock(self._lock_filename):
+            self.store.update_deadline(deadline, deadlines)
+            self._written(deadlines)
+
+    def delete_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        with file_lock(self._lock_filename):
+            self.store.delete_deadline(deadline, deadlines)
+            self._written(deadlines)
+
+    def apply_changes(self, changes, deadlines: List[Deadline]):
+        with file_lock(self._lock_filename):
+            self.store.apply_changes(changes, deadlines)
+            self._written(deadlines)
+
+    def _written(self, deadlines):
+        """Запоминает записанный список и подпись файлов (вызывается под блокировкой файла)"""
+        self._latest = deadlines
+        self._latest_signature = self.cache.signature()
+
+    def next_deadlines(self, limit: int, current_time=None) -> List[Deadline]:
+        return self.store.next_deadlines(limit, current_time)
+
+    def urgent_deadlines(self, current_time=None) -> List[Deadline]:
+        return self.store.urgent_deadlines(current_time)
+
+    def next_urgent_time(self, current_time=None):
+        return self.store.next_urgent_time(current_time)
+
+    @property
+    def indexed(self):
+        return self.store.indexed
+
+    @property
+    def partial_load(self):
+        return self.store.partial_load
+
+    def close(self):
+        self.store.close()
+        if self._latest is None:
+            return
+        with file_lock(self._lock_filename):
+            if self.cache.signature() != self._latest_signature:
+                # Файлы менялись после нашей последней записи (другой процесс или сжатие журнала)
+                return
+            self.cache.save(self._latest, self._latest_signature)
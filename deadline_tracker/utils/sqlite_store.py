@@ -0,0 +1,200 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from models.deadline import Deadline
+from utils.store import DeadlineStore
+
+
+def _to_db_time(value: datetime) -> str:
+    """Время в строке фиксированной ширины, чтобы сравнение строк совпадало с сравнением дат"""
+    return value.isoformat(timespec="microseconds")
+
+
+class SqliteDeadlineStore(DeadlineStore):
+    """Хранилище дедлайнов в SQLite.
+
+    Дата дедлайна и момент, когда дедлайн становится срочным (urgent_from),
+    проиндексированы, поэтому выборки ближайших и срочных дедлайнов
+    выполняются по индексу без загрузки всего списка в память.
+    """
+
+    indexed = True
+    partial_load = True
+
+    def __init__(self, filename="deadlines.db"):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS deadlines (
+                    key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    deadline TEXT NOT NULL,
+                    days_needed INTEGER,
+                    created TEXT NOT NULL,
+                    urgent_from TEXT
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_deadlines_deadline ON deadlines (deadline)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_deadlines_urgent_from ON deadlines (urgent_from)")
+
+    @staticmethod
+    def _to_row(deadline: Deadline):
+        urgent_from = None
+        if deadline.days_needed is not None:
+            # is_urgent: (deadline - now).days < days_needed  <=>  now > deadline - days_needed
+            urgent_from = _to_db_time(deadline.deadline - timedelta(days=deadline.days_needed))
+
+        return (
+            deadline.id,
+            deadline.name,
+            _to_db_time(deadline.deadline),
+            deadline.days_needed,
+            _to_db_time(deadline.created),
+            urgent_from
+        )
+
+    @staticmethod
+    def _from_row(row) -> Deadline:
+        key, name, deadline, days_needed, created = row
+        return Deadline(
+            name=name,
+            deadline=datetime.fromisoformat(deadline),
+            days_needed=days_needed,
+            created=datetime.fromisoformat(created),
+            id=key
+        )
+
+    def _query(self, sql, params=()) -> List[Deadline]:
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return [self._from_row(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Ошибка загрузки данных: {e}")
+            return []
+
+    def _write(self, sql, params):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, params)
+        except sqlite3.Error as e:
+            raise Exception(f"Ошибка сохранения данных: {e}")
+
+    def load_deadlines(self) -> List[Deadline]:
+        """Загружает все дедлайны из базы"""
+        return self._query(
+            "SELECT key, name, deadline, days_needed, created FROM deadlines ORDER BY deadline")
+
+    def load_records(self) -> List[dict]:
+        """Все дедлайны базы в виде словарей; ошибки чтения не скрываются"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, name, deadline, days_needed, created FROM deadlines").fetchall()
+        return [self._from_row(row).to_dict() for row in rows]
+
+    def record_reader(self) -> Callable[[], Dict[str, dict]]:
+        """Чтение записей, при котором словари создаются только для изменившихся строк"""
+        cache = {}  # строка таблицы -> словарь
+
+        def read():
+            nonlocal cache
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, name, deadline, days_needed, created FROM deadlines").fetchall()
+            parsed = {}
+            for row in rows:
+                item = cache.get(row)
+                parsed[row] = item if item is not None else self._from_row(row).to_dict()
+            cache = parsed
+            return {row[0]: item for row, item in parsed.items()}
+
+        return read
+
+    def save_deadlines(self, deadlines: List[Deadline]):
+        """Заменяет содержимое базы списком дедлайнов (одна транзакция)"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM deadlines")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO deadlines VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._to_row(d) for d in deadlines))
+        except sqlite3.Error as e:
+            raise Exception(f"Ошибка сохранения данных: {e}")
+
+    def add_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Добавляет одну строку"""
+        self._write("INSERT OR REPLACE INTO deadlines VALUES (?, ?, ?, ?, ?, ?)",
+                    self._to_row(deadline))
+
+    def update_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Обновляет одну строку"""
+        self._write("INSERT OR REPLACE INTO deadlines VALUES (?, ?, ?, ?, ?, ?)",
+                    self._to_row(deadline))
+
+    def delete_deadline(self, deadline: Deadline, deadlines: List[Deadline] = None):
+        """Удаляет одну строку"""
+        self._write("DELETE FROM deadlines WHERE key = ?", (deadline.id,))
+
+    def apply_changes(self, changes, deadlines: List[Deadline] = None):
+        """Применяет пачку изменений в одной транзакции"""
+        try:
+            with self._lock, self._conn:
+                for op, deadline in changes:
+                    if op == "delete":
+                        self._conn.execute("DELETE FROM deadlines WHERE key = ?", (deadline.id,))
+                    else:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO deadlines VALUES (?, ?, ?, ?, ?, ?)",
+                            self._to_row(deadline))
+        except sqlite3.Error as e:
+            raise Exception(f"Ошибка сохранения данных: {e}")
+
+    def next_deadlines(self, limit: int, current_time=None) -> List[Deadline]:
+        """Ближайшие непросроченные дедлайны (просмотр диапазона индекса по deadline)"""
+        if current_time is None:
+            current_time = datetime.now()
+        return self._query(
+            "SELECT key, name, deadline, days_needed, created FROM deadlines "
+            "WHERE deadline > ? ORDER BY deadline LIMIT ?",
+            (_to_db_time(current_time), limit))
+
+    def urgent_deadlines(self, current_time=None) -> List[Deadline]:
+        """Срочные дедлайны (просмотр диапазона индекса по urgent_from)"""
+        if current_time is None:
+            current_time = datetime.now()
+        urgent = self._query(
+            "SELECT key, name, deadline, days_needed, created FROM deadlines "
+            "WHERE urgent_from < ?",
+            (_to_db_time(current_time),))
+        urgent.sort(key=lambda d: d.deadline)
+        return urgent
+
+    def next_urgent_time(self, current_time=None) -> Optional[datetime]:
+        """Ближайший переход в срочные (первая запись индекса по urgent_from после current_time)"""
+        if current_time is None:
+            current_time = datetime.now()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT MIN(urgent_from) FROM deadlines WHERE urgent_from >= ?",
+                    (_to_db_time(current_time),)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Ошибка загрузки данных: {e}")
+            return None
+        if row[0] is None:
+            return None
+        # Срочным дедлайн становится сразу после urgent_from (сравнение строгое)
+        return datetime.fromisoformat(row[0]) + timedelta(microseconds=1)
+
+    def close(self):
+        """Закрывает соединение с базой"""
+        with self._lock:
+            self._conn.close()
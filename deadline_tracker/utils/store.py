@@ -0,0 +1,177 @@
+import heapq
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from models.deadline import Deadline, item_id
+
+# Разделитель элементов массива, записанного json.dumps(..., indent=2): строк
+# внутри значений не бывает (переводы строк экранируются), а вложенные
+# объекты записей имеют больший отступ
+_ARRAY_ITEM_SEPARATOR = "\n  },\n  {\n"
+
+
+def split_json_array(text: str) -> Optional[List[str]]:
+    """Содержимое объектов массива в формате json.dumps(indent=2) без фигурных
+    скобок; None для другого формата"""
+    text = text.strip()
+    if text == "[]":
+        return []
+    if not (text.startswith("[\n  {\n") and text.endswith("\n  }\n]")):
+        return None
+    return text[5:-4].split(_ARRAY_ITEM_SEPARATOR)
+
+
+class RecordParser:
+    """Разбирает тексты записей JSON с запоминанием.
+
+    При следующем чтении файла json.loads вызывается только для новых
+    и изменившихся текстов, а неизменившиеся записи возвращаются теми же
+    объектами, поэтому сравнение с прошлым чтением обходится проверкой is.
+    Тексты сравниваются с прошлыми по порядку (совпадающие начало и конец
+    списка), по словарю ищутся только тексты между ними.
+    """
+
+    def __init__(self):
+        self._texts = []
+        self._entries = []  # (id, словарь) для каждого текста из _texts
+
+    def parse(self, texts: Iterable[str], decode=json.loads) -> Dict[str, dict]:
+        """Записи по id"""
+        texts = list(texts)
+        previous, entries = self._texts, self._entries
+        size = min(len(texts), len(previous))
+        start = 0
+        while start < size and texts[start] == previous[start]:
+            start += 1
+        end = 0
+        while end < size - start and texts[-1 - end] == previous[-1 - end]:
+            end += 1
+
+        middle = dict(zip(previous[start:len(previous) - end], entries[start:len(entries) - end]))
+        changed = []
+        for text in texts[start:len(texts) - end]:
+            entry = middle.get(text)
+            if entry is None:
+                item = decode(text)
+                entry = (item_id(item), item)
+            changed.append(entry)
+
+        self._texts = texts
+        self._entries = entries[:start] + changed + entries[len(entries) - end:]
+        return dict(self._entries)
+
+    def parse_array(self, text: str) -> Dict[str, dict]:
+        """Записи массива JSON по id; массив в другом формате разбирается целиком"""
+        texts = split_json_array(text)
+        if texts is None:
+            return {item_id(item): item for item in json.loads(text)}
+        return self.parse(texts, lambda part: json.loads("{" + part + "}"))
+
+
+class DeadlineStore(ABC):
+    """Интерфейс хранилища дедлайнов, с которым работает MainWindow"""
+
+    # next_deadlines, urgent_deadlines и next_urgent_time выполняются по индексу,
+    # не читая весь список: их можно вызывать при каждой проверке
+    indexed = False
+    # next_deadlines читает только начало данных (индекс или файл, упорядоченный по дате)
+    partial_load = False
+
+    @abstractmethod
+    def load_deadlines(self) -> List[Deadline]:
+        """Загружает все дедлайны"""
+
+    @abstractmethod
+    def save_deadlines(self, deadlines: List[Deadline]):
+        """Сохраняет полный список дедлайнов"""
+
+    def add_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        """Сохраняет добавленный дедлайн"""
+        self.save_deadlines(deadlines)
+
+    def update_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        """Сохраняет изменённый дедлайн"""
+        self.save_deadlines(deadlines)
+
+    def delete_deadline(self, deadline: Deadline, deadlines: List[Deadline]):
+        """Сохраняет список после удаления дедлайна"""
+        self.save_deadlines(deadlines)
+
+    def apply_changes(self, changes: List[Tuple[str, Deadline]], deadlines: List[Deadline]):
+        """Сохраняет пачку изменений ("put" или "delete", дедлайн) за один раз"""
+        self.save_deadlines(deadlines)
+
+    def load_records(self) -> List[dict]:
+        """Читает записи (словари to_dict) с диска, не меняя состояние хранилища.
+
+        В отличие от load_deadlines ошибки чтения не скрываются: пустой
+        список должен означать пустой файл, а не неудачное чтение.
+        """
+        return [deadline.to_dict() for deadline in self.load_deadlines()]
+
+    def record_reader(self) -> Callable[[], Dict[str, dict]]:
+        """Функция, которая при каждом вызове читает записи с диска по id.
+
+        Файловые хранилища запоминают прочитанное и при повторных
+        вызовах разбирают только изменившиеся записи; ошибки, как
+        и в load_records, не скрываются.
+        """
+        return lambda: {item_id(item): item for item in self.load_records()}
+
+    def next_deadlines(self, limit: int, current_time=None) -> List[Deadline]:
+        """Возвращает ближайшие limit непросроченных дедлайнов по возрастанию даты"""
+        if current_time is None:
+            current_time = datetime.now()
+        upcoming = (d for d in self.load_deadlines() if d.deadline > current_time)
+        return heapq.nsmallest(limit, upcoming, key=lambda d: d.deadline)
+
+    def urgent_deadlines(self, current_time=None) -> List[Deadline]:
+        """Возвращает срочные дедлайны по возрастанию даты"""
+        if current_time is None:
+            current_time = datetime.now()
+        urgent = [d for d in self.load_deadlines() if d.is_urgent(current_time)]
+        urgent.sort(key=lambda d: d.deadline)
+        return urgent
+
+    def next_urgent_time(self, current_time=None) -> Optional[datetime]:
+        """Когда ближайший еще не срочный дедлайн станет срочным; None, если таких нет"""
+        if current_time is None:
+            current_time = datetime.now()
+        # is_urgent строгий: дедлайн становится срочным сразу после deadline - days_needed
+        times = [d.deadline - timedelta(days=d.days_needed) + timedelta(microseconds=1)
+                 for d in self.load_deadlines()
+                 if d.days_needed is not None and not d.is_urgent(current_time)]
+        return min(times) if times else None
+
+    def close(self):
+        """Освобождает ресурсы хранилища"""
+
+
+def create_store(backend: str, filename: str) -> DeadlineStore:
+    """Создает хранилище по имени из config.STORAGE_BACKEND"""
+    from utils.file_manager import FileManager
+
+    if backend == "json":
+        return FileManager(filename)
+
+    if backend == "journal":
+        from utils.journal_store import JournalFileManager
+        return JournalFileManager(filename)
+
+    if backend == "jsonl":
+        from utils.jsonl_store import JsonLinesFileManager
+        return JsonLinesFileManager(os.path.splitext(filename)[0] + ".jsonl", filename)
+
+    if backend == "sqlite":
+        from utils.sqlite_store import SqliteDeadlineStore
+        db_filename = os.path.splitext(filename)[0] + ".db"
+        is_new = not os.path.exists(db_filename)
+        store = SqliteDeadlineStore(db_filename)
+        # Переносим существующий JSON файл в новую базу
+        if is_new and os.path.exists(filename):
+            store.save_deadlines(FileManager(filename).load_deadlines())
+        return store
+
+    raise ValueError(f"Неизвестный тип хранилища: {backend}")
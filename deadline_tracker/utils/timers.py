@@ -0,0 +1,76 @@
+"""Именованные таймеры поверх after()/after_cancel() Tk.
+
+У каждого имени не больше одного ожидающего таймера: schedule()
+заменяет прежний, а request() сливается с уже ожидающим. Так
+периодическое обновление, которое само себя перепланирует, и
+обновления после каждого изменения не размножают отложенные вызовы.
+
+Модуль не зависит от остального пакета: daily_notification.py
+импортирует его как deadline_tracker.utils.timers.
+"""
+
+
+class TimerRegistry:
+    def __init__(self, root):
+        self.root = root
+        self._jobs = {}  # имя -> id задания after
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.coalesced = 0
+
+    def schedule(self, name, delay_ms, callback):
+        """Вызовет callback через delay_ms; ожидающий таймер с тем же именем отменяется"""
+        self.cancel(name)
+
+        def run():
+            del self._jobs[name]
+            self.fired += 1
+            callback()
+
+        self._jobs[name] = self.root.after(max(int(delay_ms), 0), run)
+        self.scheduled += 1
+
+    def request(self, name, callback, delay_ms=0) -> bool:
+        """Вызовет callback через delay_ms, если таймер name еще не ожидает.
+
+        Повторные запросы до срабатывания сливаются с первым; возвращает,
+        был ли поставлен новый таймер.
+        """
+        if name in self._jobs:
+            self.coalesced += 1
+            return False
+        self.schedule(name, delay_ms, callback)
+        return True
+
+    def cancel(self, name) -> bool:
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return False
+        self.root.after_cancel(job)
+        self.cancelled += 1
+        return True
+
+    def cancel_all(self):
+        for name in list(self._jobs):
+            self.cancel(name)
+
+    def is_pending(self, name) -> bool:
+        return name in self._jobs
+
+    def pending(self) -> int:
+        """Число ожидающих таймеров"""
+        return len(self._jobs)
+
+    def pending_names(self):
+        return sorted(self._jobs)
+
+    def stats(self) -> dict:
+        """Счетчики для наблюдения: ожидающие, поставленные, сработавшие, отмененные, слитые"""
+        return {
+            "pending": len(self._jobs),
+            "scheduled": self.scheduled,
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from models.deadline import Deadline
+
+URGENT = "urgent"
+OVERDUE = "overdue"
+
+# is_urgent строгий: дедлайн становится срочным сразу после deadline - days_needed
+_URGENT_DELAY = timedelta(microseconds=1)
+
+
+class UrgencyScheduler:
+    """Планировщик переходов дедлайнов в состояния "срочно" и "просрочено".
+
+    Для каждого дедлайна заранее известны моменты, когда он станет срочным
+    и просроченным. Эти моменты хранятся в куче, поэтому вместо опроса всех
+    дедлайнов достаточно обработать наступившие переходы и узнать время
+    следующего. Устаревшие записи (после изменения или удаления дедлайна)
+    отбрасываются лениво по номеру поколения.
+    """
+
+    def __init__(self):
+        self.urgent = set()  # ключи срочных дедлайнов
+        self.overdue = set()  # ключи просроченных дедлайнов
+
+        self._heap = []  # (время, поколение, ключ, тип перехода)
+        self._deadlines = {}  # ключ -> дедлайн
+        self._generations = {}  # ключ -> поколение актуальных записей в куче
+        self._counter = itertools.count()
+
+    def rebuild(self, deadlines: List[Deadline], current_time=None):
+        """Заполняет планировщик заново по списку дедлайнов"""
+        if current_time is None:
+            current_time = datetime.now()
+
+        self.urgent.clear()
+        self.overdue.clear()
+        self._heap = []
+        self._deadlines = {}
+        self._generations = {}
+
+        for deadline in deadlines:
+            self._heap.extend(self._add(deadline, current_time))
+        heapq.heapify(self._heap)
+
+    def schedule(self, deadline: Deadline, current_time=None):
+        """Добавляет дедлайн или пересчитывает его после изменения"""
+        if current_time is None:
+            current_time = datetime.now()
+
+        self.remove(deadline)
+        for entry in self._add(deadline, current_time):
+            heapq.heappush(self._heap, entry)
+
+    def remove(self, deadline: Deadline):
+        """Убирает дедлайн; его записи в куче станут устаревшими"""
+        key = deadline.id
+        if key in self._deadlines:
+            del self._deadlines[key]
+            del self._generations[key]
+            self.urgent.discard(key)
+            self.overdue.discard(key)
+
+        # Слишком много устаревших записей - пересобираем кучу
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [entry for entry in self._heap if self._is_current(entry)]
+            heapq.heapify(self._heap)
+
+    def next_transition_time(self) -> Optional[datetime]:
+        """Время ближайшего перехода или None, если переходов не осталось"""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, current_time=None) -> List[Tuple[Deadline, str]]:
+        """Применяет наступившие переходы и возвращает их (дедлайн, тип)"""
+        if current_time is None:
+            current_time = datetime.now()
+
+        transitions = []
+        while self._heap and self._heap[0][0] <= current_time:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+
+            _, _, key, kind = entry
+            if kind == URGENT:
+                self.urgent.add(key)
+            else:
+                self.overdue.add(key)
+            transitions.append((self._deadlines[key], kind))
+
+        return transitions
+
+    def urgent_deadlines(self) -> List[Deadline]:
+        """Срочные дедлайны по возрастанию даты"""
+        urgent = [self._deadlines[key] for key in self.urgent]
+        urgent.sort(key=lambda d: d.deadline)
+        return urgent
+
+    def is_urgent(self, deadline: Deadline) -> bool:
+        return deadline.id in self.urgent
+
+    def is_overdue(self, deadline: Deadline) -> bool:
+        return deadline.id in self.overdue
+
+    def _add(self, deadline: Deadline, current_time) -> list:
+        """Вычисляет текущее состояние дедлайна и возвращает его будущие переходы"""
+        key = deadline.id
+        generation = next(self._counter)
+        self._generations[key] = generation
+        self._deadlines[key] = deadline
+
+        entries = []
+        if deadline.days_needed is not None:
+            urgent_at = deadline.deadline - timedelta(days=deadline.days_needed) + _URGENT_DELAY
+            if urgent_at <= current_time:
+                self.urgent.add(key)
+            else:
+                entries.append((urgent_at, generation, key, URGENT))
+
+        if deadline.deadline <= current_time:
+            self.overdue.add(key)
+        else:
+            entries.append((deadline.deadline, generation, key, OVERDUE))
+
+        return entries
+
+    def _is_current(self, entry) -> bool:
+        _, generation, key, _ = entry
+        return self._generations.get(key) == generation